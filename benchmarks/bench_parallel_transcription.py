@@ -0,0 +1,59 @@
+"""Wall-clock comparison of single-pass vs. parallel segment transcription.
+
+Usage:
+    python benchmarks/bench_parallel_transcription.py answer.wav [--minutes 5] [--processes 4]
+
+The recording is repeated until it is ``--minutes`` long so short samples
+still exercise the long-answer path. Both runs use the same model settings
+(WHISPER_MODEL_SIZE / WHISPER_COMPUTE_TYPE); model loading is excluded.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_coach.audio import SAMPLE_RATE  # noqa: E402
+from interview_coach.transcription import (  # noqa: E402
+    ParallelTranscriber,
+    TranscriptionEngine,
+    prepare_audio,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", help="speech recording (WAV or anything ffmpeg can decode)")
+    parser.add_argument("--minutes", type=float, default=5.0)
+    parser.add_argument("--processes", type=int, default=max(2, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    samples = prepare_audio(args.audio)
+    repeats = int(np.ceil(args.minutes * 60 * SAMPLE_RATE / len(samples)))
+    samples = np.tile(samples, repeats)[:int(args.minutes * 60 * SAMPLE_RATE)]
+    print(f"{len(samples) / SAMPLE_RATE:.0f}s of audio, {os.cpu_count()} CPUs")
+
+    engine = TranscriptionEngine(workers=1, processes=0)
+    engine.load()
+    start = time.perf_counter()
+    single = engine.transcribe(samples, detailed=True)
+    single_seconds = time.perf_counter() - start
+    print(f"single pass: {single_seconds:.1f}s ({len(single.segments)} segments)")
+
+    parallel = ParallelTranscriber(args.processes)
+    for future in parallel.prewarm():
+        future.result()
+    start = time.perf_counter()
+    result = parallel.transcribe(samples)
+    parallel_seconds = time.perf_counter() - start
+    print(f"parallel x{args.processes}: {parallel_seconds:.1f}s ({len(result.segments)} segments)")
+
+    ordered = all(a.start <= b.start for a, b in zip(result.segments, result.segments[1:]))
+    print(f"speedup: {single_seconds / parallel_seconds:.2f}x, timestamps ordered: {ordered}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-answer runtime of the local pre-scoring checks.
+
+Usage:
+    python benchmarks/bench_prescoring.py [--answers 500] [--repeats 3] [--budget-ms 10] [--check]
+
+Builds a reproducible corpus of synthetic transcripts (150-600 words with
+fillers, STAR cues and skill mentions, plus timed segments) and times
+prescore_answer() on each, after a warm-up pass (regex compilation, caches).
+Each answer's time is the best of --repeats runs, so a scheduler hiccup
+doesn't count against it. --check exits non-zero if the p95 of those times
+goes over the budget.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_coach.prescoring import prescore_answer  # noqa: E402
+from interview_coach.transcription import Segment  # noqa: E402
+
+JOB_DATA = {
+    "technical_skills": ["Python", "Kubernetes", "PostgreSQL", "C++", "machine learning", "REST APIs", "CI/CD"],
+    "soft_skills": ["communication", "mentoring", "stakeholder management", "ownership"],
+}
+VOCABULARY = (
+    "the a we team project service customer data release system deadline users problem because then so and "
+    "it was really important that our latency design review migration incident on-call rollout metrics"
+).split()
+INSERTS = [
+    "um", "uh", "you know", "like", "basically", "when I was at my previous company", "I was responsible for",
+    "I decided to", "as a result", "we reduced errors by 40%", "Python", "Kubernetes", "communication",
+]
+
+
+def build_corpus(count, seed=0):
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for _ in range(count):
+        words = list(rng.choice(VOCABULARY, size=int(rng.integers(150, 600))))
+        for position in rng.integers(0, len(words), size=len(words) // 15):
+            words.insert(int(position), INSERTS[int(rng.integers(len(INSERTS)))])
+        text = " ".join(words)
+        bounds = np.cumsum(rng.uniform(2.0, 6.0, size=len(words) // 12 + 1))
+        segments = [Segment(float(start), float(end - 0.3), "") for start, end in zip(bounds, bounds[1:])]
+        corpus.append((text, segments))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3, help="runs per answer; the fastest is kept")
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    parser.add_argument("--check", action="store_true", help="fail if the p95 answer exceeds the budget")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.answers)
+    for text, segments in corpus[:20]:
+        prescore_answer(text, "behavioral", JOB_DATA, segments)
+
+    timings = []
+    for text, segments in corpus:
+        runs = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            prescore_answer(text, "behavioral", JOB_DATA, segments)
+            runs.append((time.perf_counter() - start) * 1000)
+        timings.append(min(runs))
+
+    timings = np.array(timings)
+    words = np.mean([len(text.split()) for text, _ in corpus])
+    print(f"{len(corpus)} answers, {words:.0f} words on average")
+    print(f"mean {timings.mean():.2f} ms, p95 {np.percentile(timings, 95):.2f} ms, max {timings.max():.2f} ms "
+          f"(budget {args.budget_ms:g} ms)")
+
+    if args.check and np.percentile(timings, 95) > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
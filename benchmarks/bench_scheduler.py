@@ -0,0 +1,59 @@
+"""Drive concurrent model calls through the request scheduler against the fake server.
+
+Usage:
+    python benchmarks/fake_gemini_server.py --error-rate 0.1 --slow-fraction 0.05 &
+    python benchmarks/bench_scheduler.py [--requests 100] [--concurrency 8]
+
+GEMINI_API_ENDPOINT defaults to the fake server and GEMINI_TRANSPORT to rest.
+The scheduler settings (GEMINI_RPM, GEMINI_TPM, GEMINI_MAX_RETRIES,
+GEMINI_HEDGE_PERCENTILE, GEMINI_REQUEST_TIMEOUT, ...) are read from the
+environment as in the app. Calls bypass the response cache.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("GEMINI_API_ENDPOINT", "http://127.0.0.1:8765")
+os.environ.setdefault("GEMINI_TRANSPORT", "rest")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_coach.client import get_client  # noqa: E402
+
+
+def timed_call(client, n):
+    start = time.perf_counter()
+    try:
+        client.generate(f"Evaluate answer {n} (benchmark {time.time()})", use_cache=False)
+        return time.perf_counter() - start, None
+    except Exception as e:
+        return time.perf_counter() - start, e
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--api-key", default=os.getenv("GEMINI_API_KEY", "fake"))
+    args = parser.parse_args()
+
+    client = get_client(args.api_key)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda n: timed_call(client, n), range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, error in results if error is None)
+    failures = [error for _, error in results if error is not None]
+    print(f"{len(latencies)}/{args.requests} succeeded in {elapsed:.1f}s ({len(latencies) / elapsed:.1f} calls/s)")
+    if latencies:
+        print(f"latency p50 {latencies[len(latencies) // 2]:.2f}s, "
+              f"p95 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.2f}s, max {latencies[-1]:.2f}s")
+    if failures:
+        print(f"first failure: {failures[0]!r}")
+    print(client.scheduler.stats())
+
+
+if __name__ == "__main__":
+    main()
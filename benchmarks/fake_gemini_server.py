@@ -0,0 +1,193 @@
+"""Local stand-in for the Gemini REST API, for exercising the request scheduler.
+
+Usage:
+    python benchmarks/fake_gemini_server.py [--port 8765] [--latency 0.5] [--slow-fraction 0.05]
+        [--slow-latency 5] [--error-rate 0.1] [--rpm 30]
+
+Then point the app (or benchmarks/bench_scheduler.py) at it:
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8765 GEMINI_TRANSPORT=rest GEMINI_API_KEY=fake ...
+
+Answers generateContent, streamGenerateContent and models.get for any
+model. JSON-mode requests get a reply shaped by their responseSchema;
+others get a canned evaluation in the app's feedback format. Latency, a slow tail (for hedging),
+random 503s and a 429 requests-per-minute limit are configurable.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+EVALUATION_TEXT = """SCORE: 7/10
+
+STRENGTHS:
+- Clear structure
+- Relevant example
+
+AREAS FOR IMPROVEMENT:
+- Quantify the result
+
+BETTER PHRASING SUGGESTIONS:
+Instead of: "I helped with the project"
+Try: "I led the migration of three services"
+
+RECOMMENDED KEYWORDS TO USE:
+- ownership - shows initiative
+
+OVERALL FEEDBACK:
+A solid answer; add measurable outcomes.
+"""
+
+# google.ai.generativelanguage Type enum, as sent with enum-encoding=int
+SCHEMA_TYPES = {1: "STRING", 2: "NUMBER", 3: "INTEGER", 4: "BOOLEAN", 5: "ARRAY", 6: "OBJECT"}
+
+
+def sample_value(schema, depth=0):
+    """Fill in a value that matches a responseSchema"""
+    schema_type = schema.get("type")
+    schema_type = SCHEMA_TYPES.get(schema_type, schema_type)
+    if schema_type == "OBJECT":
+        return {name: sample_value(field, depth + 1) for name, field in schema.get("properties", {}).items()}
+    if schema_type == "ARRAY":
+        return [sample_value(schema.get("items", {}), depth + 1) for _ in range(3)]
+    if schema_type in ("NUMBER", "INTEGER"):
+        return random.randint(1, 10)
+    if schema_type == "BOOLEAN":
+        return random.random() < 0.5
+    return f"sample {random.randint(1, 10 ** 6)}"
+
+
+def response_body(text, finished=True):
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finished:
+        candidate["finishReason"] = 1
+    return {"candidates": [candidate]}
+
+
+class FakeGemini:
+    def __init__(self, latency, slow_fraction, slow_latency, error_rate, rpm):
+        self.latency = latency
+        self.slow_fraction = slow_fraction
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.rpm = rpm
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "rate_limited": 0, "errors": 0}
+
+    def admit(self):
+        """Return an HTTP error status for this request, or None to serve it"""
+        now = time.monotonic()
+        with self._lock:
+            self.counts["requests"] += 1
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if self.rpm and len(self._recent) >= self.rpm:
+                self.counts["rate_limited"] += 1
+                return 429
+            self._recent.append(now)
+            if random.random() < self.error_rate:
+                self.counts["errors"] += 1
+                return 503
+        return None
+
+    def delay(self):
+        if random.random() < self.slow_fraction:
+            return self.slow_latency
+        return random.expovariate(1 / self.latency) if self.latency else 0.0
+
+    def reply(self, request):
+        config = request.get("generationConfig", {})
+        if config.get("responseMimeType") == "application/json":
+            return json.dumps(sample_value(config.get("responseSchema", {"type": "OBJECT"})))
+        return EVALUATION_TEXT
+
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def send_json(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_error_json(self, status):
+            names = {400: "INVALID_ARGUMENT", 429: "RESOURCE_EXHAUSTED", 503: "UNAVAILABLE", 404: "NOT_FOUND"}
+            self.send_json(status, {"error": {"code": status, "message": "fake error", "status": names[status]}})
+
+        def do_GET(self):
+            # models.get, used to validate keys; keys starting with "bad" are rejected
+            path = urlparse(self.path).path
+            if "/models/" not in path:
+                self.send_error_json(404)
+                return
+            if self.headers.get("x-goog-api-key", "").startswith("bad"):
+                self.send_error_json(400)
+                return
+            name = path[path.index("models/"):]
+            self.send_json(200, {"name": name, "displayName": name, "inputTokenLimit": 1048576,
+                                 "outputTokenLimit": 65536,
+                                 "supportedGenerationMethods": ["generateContent", "countTokens"]})
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not path.endswith((":generateContent", ":streamGenerateContent")):
+                self.send_error_json(404)
+                return
+
+            status = fake.admit()
+            if status is not None:
+                self.send_error_json(status)
+                return
+            time.sleep(fake.delay())
+            text = fake.reply(request)
+
+            if path.endswith(":generateContent"):
+                self.send_json(200, response_body(text))
+            else:
+                # streamed replies arrive as a JSON array of partial responses
+                words = text.split(" ")
+                chunks = [" ".join(words[i:i + 8]) + (" " if i + 8 < len(words) else "")
+                          for i in range(0, len(words), 8)]
+                bodies = [response_body(chunk, finished=i == len(chunks) - 1) for i, chunk in enumerate(chunks)]
+                self.send_json(200, bodies)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="mean response time in seconds")
+    parser.add_argument("--slow-fraction", type=float, default=0.0, help="share of requests that take --slow-latency")
+    parser.add_argument("--slow-latency", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute before answering 429 (0: no limit)")
+    args = parser.parse_args()
+
+    fake = FakeGemini(args.latency, args.slow_fraction, args.slow_latency, args.error_rate, args.rpm)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(fake))
+    print(f"Fake Gemini API on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(fake.counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Import-time report for the app's entry points.
+
+Runs ``python -X importtime`` in a fresh interpreter for each module below and
+prints its cumulative import time plus the slowest imports it pulled in.
+
+    python benchmarks/import_time.py              # print the report
+    python benchmarks/import_time.py --check      # also fail if a budget is exceeded
+    python benchmarks/import_time.py --write      # refresh import_time_report.txt
+
+Budgets live in import_budget.json (milliseconds). Heavy dependencies such as
+faster-whisper, google-generativeai, gTTS and sounddevice are meant to load on
+first use, so they should never show up here.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.join(ROOT, "benchmarks")
+BUDGET_FILE = os.path.join(HERE, "import_budget.json")
+REPORT_FILE = os.path.join(HERE, "import_time_report.txt")
+
+MODULES = [
+    "main",
+    "interview_coach.analytics",
+    "interview_coach.audio",
+    "interview_coach.batch",
+    "interview_coach.cache",
+    "interview_coach.client",
+    "interview_coach.concurrency",
+    "interview_coach.delivery",
+    "interview_coach.evaluation",
+    "interview_coach.keys",
+    "interview_coach.pipeline",
+    "interview_coach.prescoring",
+    "interview_coach.prompts",
+    "interview_coach.recording",
+    "interview_coach.scheduler",
+    "interview_coach.schemas",
+    "interview_coach.speech",
+    "interview_coach.transcription",
+]
+# must stay out of every entry point's import graph
+LAZY_DEPENDENCIES = ["faster_whisper", "ctranslate2", "av", "google.generativeai", "grpc", "gtts", "sounddevice", "torch"]
+
+
+def measure(module, runs=3):
+    """Best-of-``runs`` cumulative import time (ms) and ``{name: (depth, ms)}`` for that run"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr.splitlines()[-1]}")
+
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative_us, name = line.split(":", 1)[1].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((depth, name.strip(), int(cumulative_us) / 1000))
+
+        # -X importtime lists a module after everything it imported, so the
+        # module's subtree is the run of nested rows right before it; anything
+        # earlier is interpreter startup (site, .pth files)
+        imports = {}
+        for i, (depth, name, ms) in enumerate(rows):
+            if depth == 0 and name == module:
+                imports[name] = (depth, ms)
+                j = i - 1
+                while j >= 0 and rows[j][0] > 0:
+                    imports.setdefault(rows[j][1], (rows[j][0], rows[j][2]))
+                    j -= 1
+                break
+        total = imports.get(module, (0, 0.0))[1]
+        if best is None or total < best[0]:
+            best = (total, imports)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="exit 1 if a module exceeds its budget")
+    parser.add_argument("--write", action="store_true", help=f"write the report to {os.path.relpath(REPORT_FILE, ROOT)}")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per module")
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE) as f:
+        budgets = json.load(f)
+
+    lines = [f"Python {platform.python_version()} on {platform.system()} {platform.machine()}", ""]
+    failures = []
+    for module in MODULES:
+        total, imports = measure(module)
+        budget = budgets.get(module)
+        status = "" if budget is None else f"(budget {budget} ms)"
+        lines.append(f"{module:<32} {total:8.1f} ms {status}")
+
+        slowest = sorted(
+            ((name, ms) for name, (depth, ms) in imports.items() if depth == 1),
+            key=lambda item: item[1], reverse=True,
+        )
+        for name, ms in slowest[:args.top]:
+            lines.append(f"    {name:<28} {ms:8.1f} ms")
+
+        if budget is not None and total > budget:
+            failures.append(f"{module} took {total:.1f} ms, budget is {budget} ms")
+        eager = [name for name in LAZY_DEPENDENCIES if name in imports]
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} at import time")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.write:
+        with open(REPORT_FILE, "w") as f:
+            f.write(report + "\n")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared engines used by both the CLI (main.py) and the Streamlit app."""
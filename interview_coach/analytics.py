@@ -0,0 +1,49 @@
+"""Interview-wide score aggregation, computed locally from evaluation records."""
+import numpy as np
+
+
+# how many of the lowest-scoring skills to call out
+WEAKEST_SKILLS = 3
+
+
+def _group_means(labels, scores):
+    names, groups = np.unique(labels, return_inverse=True)
+    sums = np.bincount(groups, weights=scores, minlength=len(names))
+    counts = np.bincount(groups, minlength=len(names))
+    return dict(zip(names.tolist(), (sums / counts).tolist()))
+
+
+def score_array(evaluations):
+    """Scores as float64, NaN where an evaluation failed or had no score"""
+    scores = np.full(len(evaluations), np.nan)
+    for i, evaluation in enumerate(evaluations):
+        if evaluation and evaluation.get("score") is not None:
+            try:
+                scores[i] = float(evaluation["score"])
+            except (TypeError, ValueError):
+                pass
+    return scores
+
+
+def summarize_evaluations(evaluations, questions, weakest=WEAKEST_SKILLS):
+    """Aggregate an interview's scores without another model call.
+
+    ``evaluations`` are evaluation records and ``questions`` the matching
+    Question records. Returns the overall mean, mean score per question type
+    and per targeted skill, and the ``weakest`` lowest-scoring skills.
+    """
+    scores = score_array(evaluations)
+    scored = ~np.isnan(scores)
+    if not scored.any():
+        return {"answered": 0, "mean_score": None, "by_type": {}, "by_skill": {}, "weakest_skills": []}
+
+    types = np.array([question["type"] for question in questions], dtype=object)[scored]
+    skills = np.array([question["skill"] or "general" for question in questions], dtype=object)[scored]
+    by_skill = _group_means(skills, scores[scored])
+    return {
+        "answered": int(scored.sum()),
+        "mean_score": float(scores[scored].mean()),
+        "by_type": _group_means(types, scores[scored]),
+        "by_skill": by_skill,
+        "weakest_skills": sorted(by_skill, key=by_skill.get)[:weakest],
+    }
@@ -0,0 +1,111 @@
+import io
+import os
+import wave
+
+import numpy as np
+
+
+# Whisper models expect 16 kHz mono float32
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+# frames louder than this (dBFS) count as speech
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "-45"))
+
+
+def pcm_to_float32(frames, sample_width):
+    """Convert raw little-endian PCM bytes to float32 samples in [-1, 1]"""
+    if sample_width == 1:
+        return (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    if sample_width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        samples = np.where(samples & 0x800000, samples - 0x1000000, samples)
+        return samples.astype(np.float32) / 8388608.0
+    if sample_width == 4:
+        return np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    raise ValueError(f"Unsupported sample width: {sample_width} bytes")
+
+
+def decode_wav(data):
+    """Decode WAV bytes in memory, returning (samples, sample_rate) with shape (frames, channels)"""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        samples = pcm_to_float32(wav.readframes(wav.getnframes()), wav.getsampwidth())
+    return samples.reshape(-1, channels), sample_rate
+
+
+def to_mono(samples):
+    if samples.ndim == 1:
+        return samples
+    return samples.mean(axis=1, dtype=np.float32)
+
+
+def _lowpass(samples, cutoff, taps=63):
+    """Windowed-sinc FIR low-pass; ``cutoff`` is a fraction of the sample rate"""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    kernel /= kernel.sum()
+    return np.convolve(samples, kernel.astype(np.float32), mode="same")
+
+
+def resample(samples, orig_rate, target_rate=SAMPLE_RATE):
+    """Resample mono audio with linear interpolation (low-pass filtered first when downsampling)"""
+    if orig_rate == target_rate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+    if target_rate < orig_rate:
+        samples = _lowpass(samples, 0.5 * target_rate / orig_rate)
+
+    duration = len(samples) / orig_rate
+    target_times = np.arange(int(round(duration * target_rate)), dtype=np.float64) / target_rate
+    source_times = np.arange(len(samples), dtype=np.float64) / orig_rate
+    return np.interp(target_times, source_times, samples).astype(np.float32)
+
+
+def normalize(samples):
+    """Integer PCM arrays (e.g. from sounddevice) to float32 in [-1, 1]"""
+    if np.issubdtype(samples.dtype, np.integer):
+        info = np.iinfo(samples.dtype)
+        if info.min == 0:
+            return (samples.astype(np.float32) - (info.max + 1) / 2) / ((info.max + 1) / 2)
+        return samples.astype(np.float32) / float(-info.min)
+    return samples.astype(np.float32, copy=False)
+
+
+def load_audio(audio, sample_rate=None):
+    """Turn WAV bytes or a sample array into 16 kHz mono float32 for Whisper"""
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        samples, sample_rate = decode_wav(bytes(audio))
+    else:
+        samples = normalize(np.asarray(audio))
+        sample_rate = sample_rate or SAMPLE_RATE
+    return resample(to_mono(samples), sample_rate)
+
+
+def frame_energy(samples, sample_rate, frame_ms=FRAME_MS):
+    """RMS level in dBFS of each complete ``frame_ms`` frame"""
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:count * frame].reshape(count, frame)
+    power = np.einsum("ij,ij->i", frames, frames) / frame
+    return 10 * np.log10(power + 1e-10)
+
+
+def voiced_frames(samples, sample_rate, threshold_db=VAD_THRESHOLD_DB, frame_ms=FRAME_MS):
+    return frame_energy(samples, sample_rate, frame_ms) > threshold_db
+
+
+def trim_silence(samples, sample_rate, threshold_db=VAD_THRESHOLD_DB, padding_ms=200, frame_ms=FRAME_MS):
+    """Drop leading and trailing silence, keeping ``padding_ms`` around the speech"""
+    voiced = np.flatnonzero(voiced_frames(samples, sample_rate, threshold_db, frame_ms))
+    if len(voiced) == 0:
+        return samples[:0]
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    padding = int(sample_rate * padding_ms / 1000)
+    start = max(0, voiced[0] * frame - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame + padding)
+    return samples[start:end]
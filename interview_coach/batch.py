@@ -0,0 +1,134 @@
+"""Headless question-bank generation for many job descriptions (``python main.py batch``)."""
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from interview_coach import pipeline
+
+
+# job descriptions processed at once; their Gemini calls still share the scheduler's rate limit
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+
+def job_id(job):
+    """Stable id for an input row: its ``id`` field, else a hash of its contents"""
+    if job.get("id"):
+        return str(job["id"])
+    content = json.dumps([job["job_profile"], job["job_description"], job["difficulty"], job["counts"]],
+                         sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_job(row):
+    """Fill in defaults for one input row, raising ValueError if it can't be used"""
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object, got {type(row).__name__}")
+    if not row.get("job_description"):
+        raise ValueError("missing job_description")
+    given = row.get("counts") or {}
+    if isinstance(given, str):
+        given = json.loads(given)
+    if not isinstance(given, dict):
+        raise ValueError("counts should be an object")
+    counts = {}
+    for question_type, default in pipeline.DEFAULT_QUESTION_COUNTS.items():
+        # an explicit 0 is kept; only absent or blank (empty CSV cell) counts fall back
+        value = row.get(question_type)
+        if value is None or value == "":
+            value = given.get(question_type)
+        if value is None or value == "":
+            value = default
+        counts[question_type] = int(value)
+    job = {
+        "id": row.get("id") or None,
+        "job_profile": row.get("job_profile") or "",
+        "job_description": row["job_description"],
+        "difficulty": (row.get("difficulty") or "easy").lower(),
+        "counts": counts,
+    }
+    if job["difficulty"] not in ("easy", "medium", "hard"):
+        raise ValueError(f"unknown difficulty {job['difficulty']!r}")
+    job["id"] = job_id(job)
+    return job
+
+
+def read_jobs(path):
+    """Read job rows from a .csv file (with a header row) or a JSON Lines file.
+
+    Columns/fields: job_profile, job_description, difficulty, and counts either
+    as behavioral/technical/situational columns or a ``counts`` object; ``id``
+    is optional. Returns ``(jobs, problems)`` where problems lists unusable rows.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            # parsed per row below, so one bad line doesn't sink the file
+            rows = [line for line in f if line.strip()]
+
+    jobs = []
+    problems = []
+    for number, row in enumerate(rows, 1):
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+            jobs.append(_normalize_job(row))
+        except (ValueError, TypeError, KeyError) as e:
+            problems.append(f"row {number}: {e}")
+    return jobs, problems
+
+
+def completed_ids(path):
+    """Ids already written with their full question set, so a rerun can skip them"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a line cut short by an interruption
+                continue
+            if isinstance(record, dict) and "id" in record and "error" not in record:
+                done.add(record["id"])
+    return done
+
+
+def process_job(api_key, job, use_cache=True):
+    """Analyze one job description and generate its questions, returning an output record"""
+    start = time.monotonic()
+    record = {"id": job["id"], "job_profile": job["job_profile"], "difficulty": job["difficulty"]}
+    try:
+        job_data = pipeline.analyze_job_description(api_key, job["job_description"], job["job_profile"])
+        questions, errors = pipeline.generate_question_sets(
+            api_key, job_data, job["counts"], job["difficulty"], use_cache=use_cache
+        )
+    except Exception as e:
+        record["error"] = str(e)
+    else:
+        record["job_data"] = job_data
+        record["questions"] = questions
+        if errors:
+            record["question_errors"] = {question_type: str(error) for question_type, error in errors.items()}
+        requested = sum(job["counts"].values())
+        if errors or len(questions) < requested:
+            # kept for inspection, but an incomplete bank counts as failed so --resume retries it
+            record["error"] = f"{len(questions)} of {requested} questions generated"
+    record["seconds"] = round(time.monotonic() - start, 2)
+    return record
+
+
+def run_batch(api_key, jobs, concurrency=BATCH_CONCURRENCY, use_cache=True):
+    """Process jobs with at most ``concurrency`` in flight, yielding each record as it finishes"""
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+    try:
+        futures = [pool.submit(process_job, api_key, job, use_cache) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # on interruption, drop rows that haven't started; finished ones are already written
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from interview_coach.scheduler import estimate_tokens
+
+
+CACHE_DIR = os.path.expanduser(os.getenv("COACH_CACHE_DIR", "~/.cache/ai-interview-coach"))
+CACHE_TTL = float(os.getenv("COACH_CACHE_TTL", str(7 * 24 * 3600)))
+MEMORY_ITEMS = int(os.getenv("COACH_CACHE_MEMORY_ITEMS", "256"))
+DISK_ITEMS = int(os.getenv("COACH_CACHE_DISK_ITEMS", "5000"))
+
+
+def cache_key(model_name, prompt):
+    """Content address for a request: hash of the model name and the fully rendered prompt"""
+    return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of model responses: an in-memory LRU in front of SQLite.
+
+    Both tiers expire entries after ``ttl`` seconds and evict least recently
+    used entries past their size limit. If the disk tier can't be opened
+    (e.g. a read-only filesystem) the cache quietly runs memory-only.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, "responses.sqlite3"), ttl=CACHE_TTL,
+                 memory_items=MEMORY_ITEMS, disk_items=DISK_ITEMS):
+        self.ttl = ttl
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = self._open(path) if path else None
+
+    def _open(self, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error):
+            return None
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl:
+                    self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._writes += 1
+                if self._writes % 50 == 0:
+                    self._evict_disk(now)
+                self._db.commit()
+
+    def _remember(self, key, value, created):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.disk_items,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_items": len(self._memory),
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide response cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def cached_generate(model, prompt, use_cache=True, generation_config=None, variant=None, scheduler=None,
+                    timeout=None):
+    """``model.generate_content(prompt).text`` behind the response cache.
+
+    ``use_cache=False`` skips the lookup (fresh output wanted) but still stores
+    the new response. Calls that change the reply format through
+    ``generation_config`` pass a ``variant`` name so they get their own entries.
+    Misses go through ``scheduler`` (rate limit, retries) when one is given.
+    """
+    cache = get_cache()
+    model_name = model.model_name if variant is None else f"{model.model_name}/{variant}"
+    key = cache_key(model_name, prompt)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    def request(timeout):
+        request_options = {"timeout": timeout} if timeout else None
+        return model.generate_content(prompt, generation_config=generation_config,
+                                      request_options=request_options).text
+
+    if scheduler is None:
+        text = request(timeout)
+    else:
+        text = scheduler.call(request, tokens=estimate_tokens(prompt), timeout=timeout)
+        scheduler.limiter.charge(estimate_tokens(text))
+    cache.set(key, text)
+    return text
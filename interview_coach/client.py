@@ -0,0 +1,248 @@
+import itertools
+import json
+import os
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from interview_coach.cache import cache_key, cached_generate, get_cache
+from interview_coach.keys import POOLED, get_pool
+from interview_coach.scheduler import REQUEST_TIMEOUT, estimate_tokens, get_scheduler, is_rate_limited
+
+
+MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# distinct API keys (i.e. Streamlit users) whose connections we keep open
+MAX_CLIENTS = int(os.getenv("GEMINI_MAX_CLIENTS", "64"))
+# point at another server (e.g. benchmarks/fake_gemini_server.py with GEMINI_TRANSPORT=rest)
+API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+# "grpc" (library default) or "rest"
+TRANSPORT = os.getenv("GEMINI_TRANSPORT") or None
+# how long a successfully validated key is trusted without asking the API again
+KEY_VALIDATION_TTL = float(os.getenv("GEMINI_KEY_VALIDATION_TTL", "3600"))
+VALIDATION_TIMEOUT = 10
+
+
+def _schema_name(schema):
+    """Readable name for a response schema such as ``JobAnalysis`` or ``list[Question]``"""
+    args = typing.get_args(schema)
+    if args:
+        return f"{typing.get_origin(schema).__name__}[{', '.join(_schema_name(arg) for arg in args)}]"
+    return schema.__name__
+
+
+def _genai():
+    """google-generativeai (and its gRPC stack) loads on first use rather than at app startup"""
+    import google.generativeai as genai
+    from google.ai import generativelanguage as glm
+    return genai, glm
+
+
+def _client_options(api_key):
+    client_options = {"api_key": api_key}
+    if API_ENDPOINT:
+        client_options["api_endpoint"] = API_ENDPOINT
+    return client_options
+
+
+class GeminiClient:
+    """Model handle plus the service connection for one API key.
+
+    ``genai.configure()`` swaps a process-global client, which is slow to
+    repeat per call and unsafe when sessions with different keys run
+    concurrently. Each GeminiClient instead owns its own service client, so
+    the underlying channel stays open and is reused by every request.
+    """
+
+    def __init__(self, api_key, model_name=MODEL_NAME, scheduler=None):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.scheduler = scheduler or get_scheduler(api_key)
+        genai, glm = _genai()
+        self._service = glm.GenerativeServiceClient(client_options=_client_options(api_key), transport=TRANSPORT)
+        self.model = genai.GenerativeModel(model_name)
+        self.model._client = self._service
+
+    def generate(self, prompt, use_cache=True, timeout=None):
+        """Return the model's text for ``prompt``, served from the response cache when possible"""
+        return cached_generate(self.model, prompt, use_cache, scheduler=self.scheduler, timeout=timeout)
+
+    def generate_json(self, prompt, schema, use_cache=True, timeout=None):
+        """Return the decoded reply for ``prompt`` in JSON mode, constrained to ``schema`` by the API"""
+        generation_config = {
+            "response_mime_type": "application/json",
+            "response_schema": schema,
+        }
+        text = cached_generate(self.model, prompt, use_cache, generation_config, variant=f"json/{_schema_name(schema)}",
+                               scheduler=self.scheduler, timeout=timeout)
+        return json.loads(text)
+
+    def generate_stream(self, prompt, use_cache=True, timeout=None):
+        """Yield the model's text for ``prompt`` as it arrives, caching the full reply at the end.
+
+        Opening the stream (up to its first chunk) is rate limited and retried
+        like any other call; a stream that fails part-way raises to the caller.
+        """
+        cache = get_cache()
+        key = cache_key(self.model.model_name, prompt)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        def open_stream(timeout):
+            stream = iter(self.model.generate_content(prompt, stream=True, request_options={"timeout": timeout}))
+            return next(stream, None), stream
+
+        # a duplicate stream would be read by nobody, so streams are never hedged
+        first, stream = self.scheduler.call(open_stream, tokens=estimate_tokens(prompt), timeout=timeout, hedge=False)
+        parts = []
+        for chunk in itertools.chain([first] if first is not None else [], stream):
+            if not chunk.parts:
+                continue
+            parts.append(chunk.text)
+            yield chunk.text
+        text = "".join(parts)
+        self.scheduler.limiter.charge(estimate_tokens(text))
+        cache.set(key, text)
+
+
+class PooledClient:
+    """Same interface as GeminiClient, but each call borrows a key from the operator's KeyPool.
+
+    A call rejected with 429 moves on to every other key. Once all of them
+    have answered 429 it backs off (jittered, as the scheduler does) and waits
+    for the first key to come out of its cooldown, up to the scheduler's
+    retry limit, before the error reaches the caller.
+    """
+
+    def __init__(self, pool, model_name=MODEL_NAME):
+        self.pool = pool
+        self.model_name = model_name
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _client(self, key):
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = GeminiClient(key, self.model_name, scheduler=self.pool.scheduler(key))
+                self._clients[key] = client
+            return client
+
+    def _acquire(self, tried, timeout):
+        return self.pool.acquire(exclude=tried, timeout=timeout or REQUEST_TIMEOUT)
+
+    def _rate_limited(self, key, error, tried, rounds, timeout):
+        """Note a 429 from ``key``; after a full round of them, wait or re-raise ``error``"""
+        tried.add(key)
+        if len(tried) < len(self.pool):
+            return rounds
+        scheduler = self.pool.scheduler(key)
+        cooldown = self.pool.cooldown_remaining()
+        if rounds >= scheduler.retries or cooldown > (timeout or REQUEST_TIMEOUT):
+            raise error
+        # jittered on top of the cooldown so waiting callers don't all return at once
+        time.sleep(cooldown + scheduler.backoff(rounds))
+        tried.clear()
+        return rounds + 1
+
+    def _call(self, method, *args, timeout=None):
+        tried = set()
+        rounds = 0
+        while True:
+            key = self._acquire(tried, timeout)
+            error = None
+            try:
+                return getattr(self._client(key), method)(*args, timeout=timeout)
+            except Exception as e:
+                error = e
+                if not is_rate_limited(e):
+                    raise
+            finally:
+                self.pool.release(key, error)
+            # after release, so the key's cooldown has started before any backoff
+            rounds = self._rate_limited(key, error, tried, rounds, timeout)
+
+    def generate(self, prompt, use_cache=True, timeout=None):
+        return self._call("generate", prompt, use_cache, timeout=timeout)
+
+    def generate_json(self, prompt, schema, use_cache=True, timeout=None):
+        return self._call("generate_json", prompt, schema, use_cache, timeout=timeout)
+
+    def generate_stream(self, prompt, use_cache=True, timeout=None):
+        tried = set()
+        rounds = 0
+        while True:
+            key = self._acquire(tried, timeout)
+            error = None
+            started = False
+            try:
+                for chunk in self._client(key).generate_stream(prompt, use_cache, timeout):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                error = e
+                # once text has been yielded, switching keys would repeat it
+                if started or not is_rate_limited(e):
+                    raise
+            finally:
+                self.pool.release(key, error)
+            rounds = self._rate_limited(key, error, tried, rounds, timeout)
+
+
+_clients = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key, model_name=MODEL_NAME):
+    """Return the shared client for this API key (or for the key pool, given POOLED), creating it on first use"""
+    key = (api_key, model_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if api_key == POOLED:
+                pool = get_pool()
+                if pool is None:
+                    raise ValueError("No API key pool configured (set GEMINI_API_KEYS)")
+                client = PooledClient(pool, model_name)
+            else:
+                client = GeminiClient(api_key, model_name)
+            _clients[key] = client
+            while len(_clients) > MAX_CLIENTS:
+                # dropped, not closed: a request may still be using it
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(key)
+        return client
+
+
+_validated = {}
+_validated_lock = threading.Lock()
+
+
+def validate_key(api_key, model_name=MODEL_NAME):
+    """Check that ``api_key`` can use ``model_name``, raising the API's error if not.
+
+    Uses a model metadata lookup rather than a generation, so it costs no
+    generation quota. Keys that pass are remembered by hash (never the key
+    itself) for KEY_VALIDATION_TTL seconds across all sessions.
+    """
+    digest = cache_key(model_name, api_key)
+    now = time.monotonic()
+    with _validated_lock:
+        if _validated.get(digest, 0) > now:
+            return
+
+    _, glm = _genai()
+    # a one-off lookup: leaving the block closes the client's channel rather than leaking it
+    with glm.ModelServiceClient(client_options=_client_options(api_key), transport=TRANSPORT) as service:
+        service.get_model(name=f"models/{model_name}", timeout=VALIDATION_TIMEOUT)
+
+    with _validated_lock:
+        _validated[digest] = now + KEY_VALIDATION_TTL
+        if len(_validated) > MAX_CLIENTS:
+            for expired in [key for key, expires in _validated.items() if expires <= now]:
+                del _validated[expired]
@@ -0,0 +1,106 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+MAX_WORKERS = int(os.getenv("COACH_MAX_WORKERS", "8"))
+# streamed evaluations hold a worker for their whole generation, and speculative
+# question sets may never be used; each gets its own pool so neither can queue
+# ahead of run_concurrently()'s tasks, whose deadline includes time spent queued
+STREAM_WORKERS = int(os.getenv("COACH_STREAM_WORKERS", "8"))
+SPECULATIVE_WORKERS = int(os.getenv("COACH_SPECULATIVE_WORKERS", "6"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="coach")
+_stream_executor = ThreadPoolExecutor(max_workers=STREAM_WORKERS, thread_name_prefix="stream")
+_speculative_executor = ThreadPoolExecutor(max_workers=SPECULATIVE_WORKERS, thread_name_prefix="speculative")
+
+
+def get_executor():
+    """Return the process-wide pool used for network-bound background work"""
+    return _executor
+
+
+def get_speculative_executor():
+    """Return the pool for work that is started in case it's needed (see pipeline.speculate_questions)"""
+    return _speculative_executor
+
+
+def run_concurrently(tasks, timeout=None):
+    """Run named callables in parallel and wait at most ``timeout`` seconds overall.
+
+    Returns a dict of ``name -> (result, error)`` in the same order as ``tasks``.
+    A task that raised gets its exception as ``error``; one still running at the
+    deadline gets a ``TimeoutError``.
+    """
+    futures = {name: _executor.submit(task) for name, task in tasks.items()}
+    _, not_done = wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        if future in not_done:
+            future.cancel()
+            results[name] = (None, TimeoutError(f"{name} did not finish within {timeout} seconds"))
+        elif future.exception() is not None:
+            results[name] = (None, future.exception())
+        else:
+            results[name] = (future.result(), None)
+    return results
+
+
+class StreamingJob:
+    """Background job that exposes its partial text while a stream is consumed.
+
+    ``stream_factory`` returns an iterable of text chunks. If it fails and a
+    ``fallback`` is given, the partial text is discarded and ``fallback()``
+    (a blocking call returning the full text) is used instead.
+    """
+
+    def __init__(self, stream_factory, fallback=None):
+        self._cond = threading.Condition()
+        self._parts = []
+        self._version = 0
+        self._finished = False
+        self.future = _stream_executor.submit(self._run, stream_factory, fallback)
+
+    def _run(self, stream_factory, fallback):
+        try:
+            try:
+                for chunk in stream_factory():
+                    self._update(self._parts + [chunk])
+            except Exception:
+                if fallback is None:
+                    raise
+                self._update([])
+                self._update([fallback()])
+            return self.text
+        finally:
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    def _update(self, parts):
+        with self._cond:
+            self._parts = parts
+            self._version += 1
+            self._cond.notify_all()
+
+    @property
+    def text(self):
+        with self._cond:
+            return "".join(self._parts)
+
+    def done(self):
+        return self.future.done()
+
+    def updates(self):
+        """Yield the accumulated text every time it changes, until the job finishes"""
+        seen = -1
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._version != seen or self._finished)
+                seen = self._version
+                text = "".join(self._parts)
+                finished = self._finished
+            yield text
+            if finished:
+                return
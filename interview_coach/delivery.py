@@ -0,0 +1,90 @@
+"""Delivery metrics computed from the recorded answer audio.
+
+One pass over the 16 kHz buffer: it is split into FRAME_MS frames once and
+every metric (energy, pauses, speaking ratio, pitch) is derived from that
+frame matrix with array operations, so a two-minute answer takes tens of
+milliseconds.
+"""
+import numpy as np
+
+from interview_coach.audio import FRAME_MS, SAMPLE_RATE, VAD_THRESHOLD_DB
+
+
+# silences shorter than this are gaps between words, not pauses
+MIN_PAUSE_SECONDS = 0.3
+# speaking voice range searched for the pitch estimate
+MIN_PITCH_HZ = 75
+MAX_PITCH_HZ = 400
+# normalized autocorrelation peak a frame needs to count as pitched
+VOICING_THRESHOLD = 0.3
+# pitch spread (standard deviation, semitones) below which speech sounds flat
+MONOTONE_SEMITONES = 2.0
+
+
+def _runs(mask):
+    """Start indices and lengths of each run of True in a boolean array"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    return starts, np.flatnonzero(edges == -1) - starts
+
+
+def _frame_pitch(frames, sample_rate):
+    """Autocorrelation pitch estimate per frame (Hz), NaN where the frame isn't periodic"""
+    size = 1 << int(np.ceil(np.log2(2 * frames.shape[1])))
+    spectrum = np.fft.rfft(frames - frames.mean(axis=1, keepdims=True), n=size, axis=1)
+    autocorrelation = np.fft.irfft(np.abs(spectrum) ** 2, n=size, axis=1)
+
+    min_lag = int(sample_rate / MAX_PITCH_HZ)
+    max_lag = min(int(sample_rate / MIN_PITCH_HZ), frames.shape[1] - 1)
+    window = autocorrelation[:, min_lag:max_lag]
+    lags = window.argmax(axis=1) + min_lag
+    peaks = window.max(axis=1) / np.maximum(autocorrelation[:, 0], 1e-10)
+    return np.where(peaks > VOICING_THRESHOLD, sample_rate / lags, np.nan)
+
+
+def analyze_delivery(samples, sample_rate=SAMPLE_RATE, threshold_db=VAD_THRESHOLD_DB, frame_ms=FRAME_MS,
+                     min_pause=MIN_PAUSE_SECONDS):
+    """Energy, pause, speaking-ratio and pitch statistics for a mono float32 recording.
+
+    Returns None when the recording has no speech.
+    """
+    samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(samples) // frame
+    if count == 0:
+        return None
+    frames = samples[:count * frame].reshape(count, frame)
+
+    energy_db = 10 * np.log10(np.einsum("ij,ij->i", frames, frames) / frame + 1e-10)
+    voiced = energy_db > threshold_db
+    voiced_indices = np.flatnonzero(voiced)
+    if len(voiced_indices) == 0:
+        return None
+
+    # only silences between the first and last word count as pauses
+    span = slice(voiced_indices[0], voiced_indices[-1] + 1)
+    _, silence_lengths = _runs(~voiced[span])
+    pauses = silence_lengths * frame_ms / 1000
+    pauses = pauses[pauses >= min_pause]
+
+    pitch = _frame_pitch(frames[voiced], sample_rate)
+    pitch = pitch[~np.isnan(pitch)]
+    if len(pitch) > 1:
+        pitch_hz = float(np.median(pitch))
+        # semitones are perceptually even across low and high voices
+        pitch_variability = float(np.std(12 * np.log2(pitch / pitch_hz)))
+    else:
+        pitch_hz = pitch_variability = None
+
+    return {
+        "duration": len(samples) / sample_rate,
+        "speaking_time": len(voiced_indices) * frame_ms / 1000,
+        "speaking_ratio": float(voiced[span].mean()),
+        "pause_count": int(len(pauses)),
+        "mean_pause": float(pauses.mean()) if len(pauses) else 0.0,
+        "longest_pause": float(pauses.max()) if len(pauses) else 0.0,
+        "energy_db": float(energy_db[voiced].mean()),
+        "energy_variability_db": float(energy_db[voiced].std()),
+        "pitch_hz": pitch_hz,
+        "pitch_variability": pitch_variability,
+    }
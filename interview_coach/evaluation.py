@@ -0,0 +1,181 @@
+import os
+import re
+import time
+from functools import partial
+
+from interview_coach.concurrency import run_concurrently
+from interview_coach.prompts import batch_evaluation_prompt
+from interview_coach.schemas import EvaluationRecord, parse_evaluations
+from interview_coach.scheduler import estimate_tokens
+
+
+# rough budget for one batched request (prompt + expected reply), in tokens
+BATCH_TOKEN_BUDGET = int(os.getenv("EVALUATION_BATCH_TOKENS", "8000"))
+MAX_BATCH_SIZE = int(os.getenv("EVALUATION_MAX_BATCH_SIZE", "8"))
+# what a single structured evaluation costs us in output tokens, give or take
+REPLY_TOKENS_PER_ANSWER = 400
+PROMPT_OVERHEAD_TOKENS = 500
+# follow-up requests for answers a batched reply left out or got wrong
+MISSING_RETRIES = 1
+
+# section headers of the single-answer feedback format -> record fields
+SECTIONS = {
+    "STRENGTHS": "strengths",
+    "AREAS FOR IMPROVEMENT": "areas_for_improvement",
+    "BETTER PHRASING SUGGESTIONS": "phrasing_suggestions",
+    "RECOMMENDED KEYWORDS TO USE": "keywords",
+    "OVERALL FEEDBACK": "overall_feedback",
+}
+
+
+def split_batches(pairs, token_budget=BATCH_TOKEN_BUDGET, max_batch_size=MAX_BATCH_SIZE):
+    """Greedily pack (index, question, answer) items into batches under the token budget"""
+    batches = []
+    current = []
+    used = PROMPT_OVERHEAD_TOKENS
+    for item in pairs:
+        _, question, answer = item
+        cost = estimate_tokens(question) + estimate_tokens(answer or "") + REPLY_TOKENS_PER_ANSWER
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+            used = PROMPT_OVERHEAD_TOKENS
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def create_batch_evaluation_prompt(batch, job_data, difficulty="easy"):
+    items = "\n\n".join(
+        f"ANSWER {index}\nQUESTION ASKED:\n{question}\n\nCANDIDATE'S ANSWER:\n{answer}"
+        for index, question, answer in batch
+    )
+    return batch_evaluation_prompt.format(
+        job_title=job_data.get('job_title', 'N/A'),
+        seniority_level=job_data.get('seniority_level', 'N/A'),
+        skills=', '.join(job_data.get('technical_skills', []) + job_data.get('soft_skills', [])),
+        difficulty=difficulty,
+        items=items,
+    )
+
+
+def _evaluate_batch(generate_json, batch, job_data, difficulty):
+    """Evaluations in the reply for ``batch``, by index; answers it left out or got wrong are absent"""
+    prompt = create_batch_evaluation_prompt(batch, job_data, difficulty)
+    results = parse_evaluations(generate_json(prompt, list[EvaluationRecord]))
+    return {index: results[index] for index, _, _ in batch if index in results}
+
+
+def evaluate_answers_batch(generate_json, questions, answers, job_data, difficulty="easy",
+                           token_budget=BATCH_TOKEN_BUDGET, timeout=None, retries=MISSING_RETRIES):
+    """Evaluate many answers with as few requests as the token budget allows.
+
+    ``generate_json`` takes a prompt and a response schema and returns the
+    decoded reply (e.g. GeminiClient.generate_json). Batches run
+    concurrently. Answers missing from a reply (or malformed in it) are
+    re-requested together, up to ``retries`` more times. Returns a list
+    aligned with ``questions``: each item is the structured evaluation for
+    that index, or ``{"index": i, "error": "..."}`` if it couldn't be evaluated.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    evaluations = [None] * min(len(questions), len(answers))
+    pending = [(i, question, answer) for i, (question, answer) in enumerate(zip(questions, answers))]
+    for attempt in range(1 + retries):
+        batches = split_batches(pending, token_budget)
+        tasks = {
+            n: partial(_evaluate_batch, generate_json, batch, job_data, difficulty)
+            for n, batch in enumerate(batches)
+        }
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        results = run_concurrently(tasks, timeout=remaining)
+
+        pending = []
+        for n, (batch_results, error) in results.items():
+            for item in batches[n]:
+                index = item[0]
+                if error:
+                    evaluations[index] = {"index": index, "error": str(error)}
+                elif index in batch_results:
+                    evaluations[index] = batch_results[index]
+                else:
+                    evaluations[index] = {"index": index, "error": "No valid evaluation returned for this answer"}
+                    pending.append(item)
+        if not pending:
+            break
+    return evaluations
+
+
+def parse_evaluation(text):
+    """Parse single-answer feedback text into the same record shape as a batched evaluation.
+
+    Tolerates markdown emphasis around headers; ``score`` is None when no
+    ``SCORE: X/10`` line can be found.
+    """
+    record = {
+        "score": None,
+        "strengths": [],
+        "areas_for_improvement": [],
+        "phrasing_suggestions": [],
+        "keywords": [],
+        "overall_feedback": "",
+    }
+    feedback = []
+    section = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip().strip("*#").strip()
+        header, _, rest = line.partition(":")
+        header = header.strip("* ").upper()
+        rest = rest.strip().strip("*").strip()
+
+        if header == "SCORE":
+            score = re.search(r'\d+(?:\.\d+)?', rest)
+            if score:
+                record["score"] = min(10.0, float(score.group()))
+            section = None
+            continue
+        if header in SECTIONS and (not rest or SECTIONS[header] == "overall_feedback"):
+            section = SECTIONS[header]
+            if rest:
+                feedback.append(rest)
+            continue
+        if not line or section is None:
+            continue
+
+        item = line.lstrip("-•* ").strip()
+        if section == "overall_feedback":
+            feedback.append(line)
+        elif section == "phrasing_suggestions":
+            quoted = rest.strip('"“”')
+            if header == "INSTEAD OF":
+                record["phrasing_suggestions"].append({"instead_of": quoted, "try": ""})
+            elif header == "TRY" and record["phrasing_suggestions"]:
+                record["phrasing_suggestions"][-1]["try"] = quoted
+        elif section == "keywords":
+            keyword, _, reason = item.partition(" - ")
+            record["keywords"].append({"keyword": keyword.strip(" *"), "reason": reason.strip()})
+        else:
+            record[section].append(item)
+    record["overall_feedback"] = " ".join(feedback)
+    return record
+
+
+def format_evaluation(evaluation):
+    """Render a structured evaluation in the same layout as the single-answer feedback"""
+    if evaluation is None:
+        return "No evaluation available."
+    if "error" in evaluation:
+        return f"Evaluation failed: {evaluation['error']}"
+
+    lines = [f"SCORE: {evaluation.get('score', '?')}/10", "", "STRENGTHS:"]
+    lines += [f"- {item}" for item in evaluation.get('strengths', [])]
+    lines += ["", "AREAS FOR IMPROVEMENT:"]
+    lines += [f"- {item}" for item in evaluation.get('areas_for_improvement', [])]
+    lines += ["", "BETTER PHRASING SUGGESTIONS:"]
+    for suggestion in evaluation.get('phrasing_suggestions', []):
+        lines += [f"Instead of: \"{suggestion.get('instead_of', '')}\"", f"Try: \"{suggestion.get('try', '')}\"", ""]
+    lines += ["RECOMMENDED KEYWORDS TO USE:"]
+    lines += [f"- {item.get('keyword', '')} - {item.get('reason', '')}" for item in evaluation.get('keywords', [])]
+    lines += ["", "OVERALL FEEDBACK:", evaluation.get('overall_feedback', '')]
+    return "\n".join(lines)
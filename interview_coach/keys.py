@@ -0,0 +1,142 @@
+"""Operator-configured pool of Gemini API keys.
+
+Set GEMINI_API_KEYS to a comma-separated list and every session shares the
+pool instead of bringing its own key. Each key gets its own rate limiter
+(GEMINI_RPM / GEMINI_TPM are per-key quotas), so throughput grows with the
+number of keys. A key answered with 429 is rested for GEMINI_KEY_COOLDOWN
+seconds and the request moves to another key; once every key has answered
+429, the request backs off until the first one recovers.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+from interview_coach.scheduler import RETRYABLE_STATUS, RateLimiter, RequestScheduler, is_rate_limited
+
+
+API_KEYS = [key.strip() for key in os.getenv("GEMINI_API_KEYS", "").split(",") if key.strip()]
+# "least_loaded": fewest requests in flight, then most quota left; "round_robin": rotate
+KEY_STRATEGY = os.getenv("GEMINI_KEY_STRATEGY", "least_loaded")
+KEY_COOLDOWN = float(os.getenv("GEMINI_KEY_COOLDOWN", "60"))
+# seconds of history behind each key's "last_minute" request count
+STATS_WINDOW = 60
+# stands in for an API key wherever the front-ends pass one around
+POOLED = "<pooled>"
+
+
+def mask_key(key):
+    return f"…{key[-4:]}"
+
+
+class KeyState:
+    def __init__(self, key):
+        self.key = key
+        # a 429 moves the request to another key instead of retrying this one
+        self.scheduler = RequestScheduler(RateLimiter(), retry_status=RETRYABLE_STATUS - {429})
+        self.in_flight = 0
+        # acquire times within the last STATS_WINDOW seconds
+        self.recent = deque()
+        self.total = 0
+        self.rate_limited = 0
+        self.cooldown_until = 0.0
+
+    def trim(self, now):
+        while self.recent and now - self.recent[0] > STATS_WINDOW:
+            self.recent.popleft()
+
+
+class KeyPool:
+    def __init__(self, keys, strategy=KEY_STRATEGY, cooldown=KEY_COOLDOWN):
+        if not keys:
+            raise ValueError("A key pool needs at least one API key")
+        if strategy not in ("least_loaded", "round_robin"):
+            raise ValueError(f"Unknown key selection strategy: {strategy}")
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self._states = {key: KeyState(key) for key in keys}
+        self._rotation = itertools.cycle(keys)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._states)
+
+    def scheduler(self, key):
+        return self._states[key].scheduler
+
+    def acquire(self, exclude=(), timeout=None):
+        """Pick a key for one request; call release() with it afterwards.
+
+        When every key not in ``exclude`` is cooling down, waits for the first
+        to recover, raising TimeoutError if that's more than ``timeout`` seconds away.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                candidates = [state for key, state in self._states.items() if key not in exclude]
+                if not candidates:
+                    raise RuntimeError("Every pooled API key is rate limited")
+                ready = [state for state in candidates if state.cooldown_until <= now]
+                if ready:
+                    if self.strategy == "round_robin":
+                        ready_keys = {state.key for state in ready}
+                        state = self._states[next(key for key in self._rotation if key in ready_keys)]
+                    else:
+                        state = min(ready, key=lambda state: (state.in_flight, -state.scheduler.limiter.available()))
+                    state.in_flight += 1
+                    state.total += 1
+                    state.recent.append(now)
+                    # trimmed here too, so the window stays bounded when nobody reads stats()
+                    state.trim(now)
+                    return state.key
+                recovers = min(state.cooldown_until for state in candidates)
+
+            if deadline is not None and recovers > deadline:
+                raise TimeoutError(f"Every pooled API key is cooling down for another {recovers - now:.0f}s")
+            time.sleep(recovers - now)
+
+    def release(self, key, error=None):
+        with self._lock:
+            state = self._states[key]
+            state.in_flight -= 1
+            if error is not None and is_rate_limited(error):
+                state.rate_limited += 1
+                state.cooldown_until = time.monotonic() + self.cooldown
+
+    def cooldown_remaining(self):
+        """Seconds until the first key comes out of its cooldown (0 if one is ready)"""
+        now = time.monotonic()
+        with self._lock:
+            return max(0.0, min(state.cooldown_until for state in self._states.values()) - now)
+
+    def stats(self):
+        """Per-key usage, keyed by the masked key"""
+        now = time.monotonic()
+        with self._lock:
+            stats = {}
+            for state in self._states.values():
+                state.trim(now)
+                stats[mask_key(state.key)] = {
+                    "in_flight": state.in_flight,
+                    "last_minute": len(state.recent),
+                    "total": state.total,
+                    "rate_limited": state.rate_limited,
+                    "cooling_down": state.cooldown_until > now,
+                }
+            return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide key pool, or None when GEMINI_API_KEYS isn't set"""
+    global _pool
+    if _pool is None and API_KEYS:
+        with _pool_lock:
+            if _pool is None:
+                _pool = KeyPool(API_KEYS)
+    return _pool
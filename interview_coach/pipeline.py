@@ -0,0 +1,143 @@
+"""Interview pipeline shared by main.py and streamlit-app.py.
+
+Functions here raise on failure and never print; each front-end reports
+errors its own way (print vs. st.error). Everything is safe to call from
+background threads.
+"""
+import time
+from functools import partial
+
+from interview_coach.client import get_client
+from interview_coach.concurrency import StreamingJob, get_speculative_executor, run_concurrently
+from interview_coach.evaluation import evaluate_answers_batch
+from interview_coach.prompts import create_evaluation_prompt, create_question_prompt, jd_analysis_prompt
+from interview_coach.schemas import GeneratedQuestion, JobAnalysis, parse_job_analysis, parse_questions
+
+
+QUESTION_TYPES = ["behavioral", "technical", "situational"]
+# Step 3's preselected counts, generated speculatively while the user reviews the analysis
+DEFAULT_QUESTION_COUNTS = {"behavioral": 2, "technical": 2, "situational": 1}
+# overall deadline for generating every question category
+GENERATION_TIMEOUT = 60
+# one retry when the analysis reply doesn't match the schema
+ANALYSIS_ATTEMPTS = 2
+# extra requests for questions missing from a short reply
+QUESTION_TOP_UPS = 2
+
+
+def analyze_job_description(api_key, job_description, job_profile):
+    """Extract a JobAnalysis using the API's JSON mode, retrying once if the reply fails validation"""
+    formatted_prompt = jd_analysis_prompt.format(
+        job_profile=job_profile,
+        job_description=job_description
+    )
+    client = get_client(api_key)
+    error = None
+    for attempt in range(ANALYSIS_ATTEMPTS):
+        try:
+            # a retry must not be served the same bad reply from the cache
+            return parse_job_analysis(client.generate_json(formatted_prompt, JobAnalysis, use_cache=attempt == 0))
+        except ValueError as e:
+            error = e
+    raise ValueError(f"Job analysis reply failed validation: {error}")
+
+
+def request_questions(api_key, job_data, question_type, count, difficulty="easy", use_cache=True, existing=()):
+    """Generate ``count`` Question records of one type.
+
+    A short or malformed reply is topped up with requests for just the missing
+    questions (at most QUESTION_TOP_UPS of them) instead of regenerating the set.
+    ``existing`` questions (e.g. from speculation) are kept and only topped up.
+    """
+    client = get_client(api_key)
+    questions = list(existing[:count])
+    seen = {question["text"].lower() for question in questions}
+    for attempt in range(1 + QUESTION_TOP_UPS):
+        missing = count - len(questions)
+        if missing <= 0:
+            break
+        prompt = create_question_prompt(question_type, job_data, missing, difficulty,
+                                        exclude=[question["text"] for question in questions])
+        try:
+            generated = parse_questions(
+                client.generate_json(prompt, list[GeneratedQuestion], use_cache=use_cache and attempt == 0),
+                question_type, difficulty
+            )
+        except ValueError:
+            continue
+        for question in generated:
+            if len(questions) < count and question["text"].lower() not in seen:
+                seen.add(question["text"].lower())
+                questions.append(question)
+
+    if not questions:
+        raise ValueError(f"Failed to generate {question_type} questions")
+    return questions
+
+
+def speculate_questions(api_key, job_data, difficulty="easy", counts=DEFAULT_QUESTION_COUNTS):
+    """Start generating questions for the default counts before the user has asked for them.
+
+    Returns ``{question_type: Future}`` to hand to generate_question_sets().
+    """
+    return {
+        question_type: get_speculative_executor().submit(request_questions, api_key, job_data, question_type, count,
+                                                         difficulty)
+        for question_type, count in counts.items()
+        if count > 0
+    }
+
+
+def generate_question_sets(api_key, job_data, counts, difficulty="easy", timeout=GENERATION_TIMEOUT, use_cache=True,
+                           speculative=None):
+    """Generate all question categories concurrently.
+
+    ``speculative`` is the result of speculate_questions() for the same job and
+    difficulty: its questions are reused, topped up when more were requested,
+    trimmed when fewer were, and regenerated if speculation failed.
+
+    Returns ``(questions, errors)``: Question records in QUESTION_TYPES order,
+    and ``{question_type: exception}`` for categories that failed or missed
+    the deadline.
+    """
+    deadline = time.monotonic() + timeout
+    existing = {}
+    for question_type, future in (speculative or {}).items():
+        # one still queued behind other sessions' speculation is cheaper to request afresh
+        if counts.get(question_type, 0) <= 0 or future.cancel():
+            continue
+        try:
+            # the speculative requests run in parallel, so waiting on them in turn costs the slowest one
+            existing[question_type] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception:
+            existing[question_type] = []
+
+    tasks = {
+        question_type: partial(request_questions, api_key, job_data, question_type, counts[question_type],
+                               difficulty, use_cache, existing.get(question_type, ()))
+        for question_type in QUESTION_TYPES
+        if counts.get(question_type, 0) > 0
+    }
+    results = run_concurrently(tasks, timeout=max(0.0, deadline - time.monotonic()))
+
+    questions = []
+    errors = {}
+    for question_type, (generated, error) in results.items():
+        if error:
+            errors[question_type] = error
+            continue
+        questions.extend(generated)
+    return questions, errors
+
+
+def start_evaluation(api_key, question, answer, job_data, difficulty="easy"):
+    """Start streaming an evaluation in the background, falling back to a blocking call on error"""
+    client = get_client(api_key)
+    prompt = create_evaluation_prompt(question, answer, job_data, difficulty)
+    return StreamingJob(partial(client.generate_stream, prompt), fallback=partial(client.generate, prompt))
+
+
+def evaluate_answers(api_key, questions, answers, job_data, difficulty="easy", timeout=None):
+    """Evaluate a whole interview with batched requests (see evaluation.evaluate_answers_batch)"""
+    return evaluate_answers_batch(get_client(api_key).generate_json, questions, answers, job_data, difficulty,
+                                  timeout=timeout)
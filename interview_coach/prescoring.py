@@ -0,0 +1,119 @@
+"""Deterministic answer checks that run locally the moment a transcript exists.
+
+Nothing here calls the model, so Step 4 can show pace, filler words, STAR
+structure and skill coverage while the Gemini evaluation is still pending.
+"""
+import re
+from functools import lru_cache
+
+
+FILLER_PATTERN = re.compile(
+    r"\b(um+|uh+|erm|hmm+|you know|i mean|basically|literally|sort of|kind of)\b"
+    # "like" only as a discourse marker set off by a comma ("it was, like, hard"), not "I'd like to"
+    r"|(?:^|(?<=[.,!?]))\s*(like)(?=\s*,)",
+    re.IGNORECASE,
+)
+WORD_PATTERN = re.compile(r"[\w'+#.-]+")
+
+# cue phrases for each part of a STAR (Situation, Task, Action, Result) answer
+STAR_MARKERS = {
+    "situation": r"when i was|at my (?:previous|last|current)|in my (?:previous|last|current) (?:role|job|team)"
+                 r"|the situation|at the time|there was a|we were",
+    "task": r"my (?:task|goal|role|job|responsibility) was|i was (?:responsible|asked|tasked)"
+            r"|the goal was|i needed to|i had to|we needed to",
+    "action": r"\bi (?:decided|implemented|built|led|created|organized|proposed|started|reached out|set up"
+              r"|wrote|designed|worked with|scheduled|talked|spoke|introduced|took)",
+    "result": r"as a result|resulted in|in the end|ultimately|the outcome|we (?:achieved|delivered|shipped|reduced"
+              r"|increased|improved)|which (?:reduced|increased|improved|saved)|\d+ ?%|percent",
+}
+STAR_PATTERNS = {part: re.compile(pattern, re.IGNORECASE) for part, pattern in STAR_MARKERS.items()}
+
+# skills this short ("Go", "R", "C", "UI") are matched case-sensitively, or "let it go" would count as Go
+SHORT_SKILL_LENGTH = 2
+
+# comfortable interview pace, in words per minute
+SLOW_WPM = 110
+FAST_WPM = 170
+
+
+@lru_cache(maxsize=32)
+def _skill_patterns(skills):
+    """Compiled matchers for a tuple of skills (cached: the same job's skills are checked every answer)"""
+    patterns = []
+    for skill in skills:
+        skill = skill.strip()
+        if not skill:
+            continue
+        # "+" and "#" count as part of the name, so "C" doesn't match inside "C++" or "C#"
+        body = re.escape(skill).replace(r"\ ", r"[\s-]+")
+        flags = 0 if len(skill) <= SHORT_SKILL_LENGTH else re.IGNORECASE
+        patterns.append((skill, re.compile(r"(?<![\w+#])" + body + r"(?![\w+#])", flags)))
+    return patterns
+
+
+def speaking_seconds(segments=None, duration=None):
+    """Time spent talking: the sum of Whisper segment spans, else the recording length"""
+    if segments:
+        return sum(max(0.0, segment.end - segment.start) for segment in segments)
+    return duration
+
+
+def count_fillers(text):
+    fillers = {}
+    for match in FILLER_PATTERN.finditer(text):
+        filler = (match.group(1) or match.group(2)).lower()
+        fillers[filler] = fillers.get(filler, 0) + 1
+    return fillers
+
+
+def star_structure(text):
+    """Which STAR parts an answer has cue phrases for"""
+    return {part: pattern.search(text) is not None for part, pattern in STAR_PATTERNS.items()}
+
+
+def skill_coverage(text, job_data):
+    """Split the job's technical and soft skills into those the answer mentions and those it doesn't"""
+    skills = tuple(job_data.get("technical_skills", []) + job_data.get("soft_skills", []))
+    mentioned = []
+    missing = []
+    for skill, pattern in _skill_patterns(skills):
+        (mentioned if pattern.search(text) else missing).append(skill)
+    return mentioned, missing
+
+
+def prescore_answer(text, question_type, job_data, segments=None, duration=None):
+    """Local feedback for one transcript.
+
+    ``segments`` are the transcript's timed Segments (or pass ``duration`` in
+    seconds) for the speaking pace. STAR markers are only checked for
+    behavioral questions.
+    """
+    words = len(WORD_PATTERN.findall(text))
+    fillers = count_fillers(text)
+    filler_count = sum(fillers.values())
+
+    seconds = speaking_seconds(segments, duration)
+    words_per_minute = words / seconds * 60 if seconds else None
+    if words_per_minute is None:
+        pace = None
+    elif words_per_minute < SLOW_WPM:
+        pace = "slow"
+    elif words_per_minute > FAST_WPM:
+        pace = "fast"
+    else:
+        pace = "good"
+
+    mentioned, missing = skill_coverage(text, job_data or {})
+    total_skills = len(mentioned) + len(missing)
+    return {
+        "words": words,
+        "filler_count": filler_count,
+        "fillers": fillers,
+        "filler_rate": filler_count / words * 100 if words else 0.0,
+        "words_per_minute": words_per_minute,
+        "pace": pace,
+        "star": star_structure(text) if question_type == "behavioral" else None,
+        "skills_mentioned": mentioned,
+        "skills_missing": missing,
+        "skill_coverage": len(mentioned) / total_skills if total_skills else None,
+    }
@@ -0,0 +1,266 @@
+"""Prompt templates shared by the CLI and the Streamlit app."""
+
+jd_analysis_prompt = """
+Analyze this job description and extract key information.
+
+Job Profile: {job_profile}
+Job Description: {job_description}
+
+Fill in every field with values taken from the posting:
+- job_title: exact title from posting
+- seniority_level: one of entry, mid, senior, lead
+- technical_skills: required technical skills
+- soft_skills: required soft skills
+- industry: industry type
+- experience_years: "X-Y years" or "not specified"
+- team_role: one of individual_contributor, team_lead, manager
+- key_responsibilities: main responsibilities of the role
+"""
+
+
+def create_behavioral_prompt(job_analysis, count, difficulty="easy"):
+    """Create prompt for behavioral questions with difficulty"""
+    
+    job_title = job_analysis.get('job_title', 'the position')
+    seniority = job_analysis.get('seniority_level', 'mid-level')
+    soft_skills = job_analysis.get('soft_skills', [])
+    responsibilities = job_analysis.get('key_responsibilities', [])
+    
+    # Difficulty-specific requirements
+    difficulty_requirements = {
+        "easy": """
+- Focus on basic workplace scenarios and learning experiences
+- Ask about simple challenges and how they overcame them
+- Questions about teamwork and communication at entry level
+- Example: "Tell me about a time you had to learn something new quickly"
+        """,
+        "medium": """
+- Focus on project ownership and cross-team collaboration  
+- Ask about handling competing priorities and difficult decisions
+- Questions about leadership moments and conflict resolution
+- Example: "Describe a time you had to manage multiple stakeholders with different priorities"
+        """,
+        "hard": """
+- Focus on strategic decision-making and organizational impact
+- Ask about leading through crisis and complex problem-solving
+- Questions about mentoring, architecture decisions, and business impact
+- Example: "Tell me about a time you had to make a critical decision that affected the entire organization"
+        """
+    }
+    
+    prompt = f"""
+Generate {count} behavioral interview questions for a {job_title} position at {seniority} level.
+
+DIFFICULTY LEVEL: {difficulty.upper()}
+{difficulty_requirements[difficulty]}
+
+Focus on these soft skills: {', '.join(soft_skills)}
+Key responsibilities: {', '.join(responsibilities)}
+
+Requirements for each question:
+1. Use STAR method (Situation, Task, Action, Result)
+2. Match {difficulty} difficulty level complexity
+3. Be specific to this role and seniority level
+4. Test real workplace scenarios appropriate for {difficulty} level
+5. Be answerable in 2-3 minutes
+
+For each question, also give the one skill from the job requirements it mainly tests.
+"""
+    return prompt
+
+
+def create_technical_prompt(job_analysis, count, difficulty="easy"):
+    """Create prompt for technical questions with difficulty"""
+    
+    job_title = job_analysis.get('job_title', 'the position')
+    seniority = job_analysis.get('seniority_level', 'mid-level')
+    technical_skills = job_analysis.get('technical_skills', [])
+    
+    difficulty_requirements = {
+        "easy": """
+- Focus on fundamental concepts and basic implementation
+- Ask about simple coding problems and basic system understanding
+- Test core technology knowledge without complex scenarios
+- Example: "How would you implement a basic REST API endpoint?"
+        """,
+        "medium": """
+- Focus on practical problem-solving and best practices
+- Ask about debugging, optimization, and design patterns
+- Test ability to explain trade-offs and handle moderate complexity
+- Example: "How would you optimize a slow database query and what factors would you consider?"
+        """,
+        "hard": """
+- Focus on system design, architecture, and complex problem-solving
+- Ask about scalability, distributed systems, and technical leadership
+- Test ability to design solutions and make architectural decisions
+- Example: "Design a distributed system to handle 1 million concurrent users with 99.9% uptime"
+        """
+    }
+    
+    prompt = f"""
+Generate {count} technical interview questions for a {job_title} position at {seniority} level.
+
+DIFFICULTY LEVEL: {difficulty.upper()}
+{difficulty_requirements[difficulty]}
+
+Required technical skills: {', '.join(technical_skills)}
+
+Requirements for each question:
+1. Match {difficulty} difficulty level complexity
+2. Focus on practical application appropriate for {difficulty} level
+3. Can be answered in 2-3 minutes
+4. Test real-world problem-solving at {difficulty} level
+5. Specific to the required technologies
+
+For each question, also give the one skill from the job requirements it mainly tests.
+"""
+    return prompt
+
+
+def create_situational_prompt(job_analysis, count, difficulty="easy"):
+    """Create prompt for situational questions with difficulty"""
+    
+    job_title = job_analysis.get('job_title', 'the position')
+    industry = job_analysis.get('industry', 'technology')
+    team_role = job_analysis.get('team_role', 'individual_contributor')
+    
+    difficulty_requirements = {
+        "easy": """
+- Focus on individual contributor scenarios and basic professional situations
+- Ask about learning from mistakes and asking for help
+- Simple conflict resolution and priority management
+- Example: "What would you do if you realized you made an error that affected your team?"
+        """,
+        "medium": """
+- Focus on project ownership and cross-team collaboration
+- Ask about managing competing demands and difficult conversations
+- Moderate stakeholder management and team coordination
+- Example: "How would you handle conflicting requirements from two different departments?"
+        """,
+        "hard": """
+- Focus on organizational leadership and strategic decision-making
+- Ask about crisis management and transformational change
+- Complex stakeholder management and business-critical decisions
+- Example: "What would you do if you had to lead a critical project with unclear requirements and tight deadlines?"
+        """
+    }
+    
+    prompt = f"""
+Generate {count} situational interview questions for a {job_title} in {industry} industry.
+
+DIFFICULTY LEVEL: {difficulty.upper()}
+{difficulty_requirements[difficulty]}
+
+Team role: {team_role}
+
+Requirements for each question:
+1. Present realistic workplace scenarios for {difficulty} level
+2. Test decision-making appropriate for {difficulty} complexity
+3. Match the responsibility level and industry context
+4. Start with "What would you do if..." or "How would you handle..."
+5. Be specific to the work environment
+
+For each question, also give the one skill from the job requirements it mainly tests.
+"""
+    return prompt
+
+
+def create_question_prompt(question_type, job_analysis, count, difficulty="easy", exclude=()):
+    """Prompt for ``count`` questions of one type; ``exclude`` lists questions already generated"""
+    if question_type == "behavioral":
+        prompt = create_behavioral_prompt(job_analysis, count, difficulty)
+    elif question_type == "technical":
+        prompt = create_technical_prompt(job_analysis, count, difficulty)
+    elif question_type == "situational":
+        prompt = create_situational_prompt(job_analysis, count, difficulty)
+    else:
+        raise ValueError(f"Unknown question type: {question_type}")
+    if exclude:
+        prompt += "\nDo not repeat or rephrase any of these questions:\n" + "\n".join(f"- {text}" for text in exclude) + "\n"
+    return prompt
+
+
+def create_evaluation_prompt(question, answer, job_data, difficulty="easy"):
+    """Create prompt for evaluating a single answer"""
+    prompt = f"""
+You are an expert interview coach. Evaluate this candidate's answer and provide constructive feedback.
+
+CONTEXT:
+- Job Title: {job_data.get('job_title', 'N/A')}
+- Seniority Level: {job_data.get('seniority_level', 'N/A')}
+- Required Skills: {', '.join(job_data.get('technical_skills', []) + job_data.get('soft_skills', []))}
+- Difficulty Level: {difficulty}
+
+QUESTION ASKED:
+{question}
+
+CANDIDATE'S ANSWER:
+{answer}
+
+Please provide evaluation in this EXACT format:
+
+SCORE: [X/10]
+
+STRENGTHS:
+- [Strength 1]
+- [Strength 2]
+- [Strength 3]
+
+AREAS FOR IMPROVEMENT:
+- [Area 1]
+- [Area 2] 
+- [Area 3]
+
+BETTER PHRASING SUGGESTIONS:
+Instead of: "[problematic phrase from answer]"
+Try: "[improved version]"
+
+Instead of: "[another problematic phrase]"
+Try: "[improved version]"
+
+RECOMMENDED KEYWORDS TO USE:
+- [keyword 1] - [why it's important]
+- [keyword 2] - [why it's important]
+- [keyword 3] - [why it's important]
+
+OVERALL FEEDBACK:
+[2-3 sentences of constructive advice]
+
+Evaluate based on:
+1. Structure and clarity
+2. Relevance to the question
+3. Use of specific examples
+4. Professional language
+5. Depth appropriate for {difficulty} level
+"""
+    return prompt
+
+
+batch_evaluation_prompt = """
+You are an expert interview coach. Evaluate each of the candidate's answers below and provide constructive feedback.
+
+CONTEXT:
+- Job Title: {job_title}
+- Seniority Level: {seniority_level}
+- Required Skills: {skills}
+- Difficulty Level: {difficulty}
+
+{items}
+
+Give one evaluation per answer, with these fields:
+- index: the ANSWER number above
+- score: integer 0-10
+- strengths: what the answer did well
+- areas_for_improvement: what the answer should do better
+- phrasing_suggestions: "instead_of" a phrase from the answer, "try" an improved version
+- keywords: a "keyword" the candidate should use and the "reason" it matters
+- overall_feedback: 2-3 sentences of constructive advice
+
+Evaluate based on:
+1. Structure and clarity
+2. Relevance to the question
+3. Use of specific examples
+4. Professional language
+5. Depth appropriate for {difficulty} level
+"""
+
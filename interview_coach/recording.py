@@ -0,0 +1,62 @@
+import queue
+
+import numpy as np
+
+from interview_coach.audio import FRAME_MS, SAMPLE_RATE, VAD_THRESHOLD_DB, trim_silence, voiced_frames
+
+
+# 10 VAD frames per block read from the microphone
+BLOCK_MS = FRAME_MS * 10
+# voiced frames needed before we believe the candidate has started talking
+MIN_SPEECH_FRAMES = 5
+
+
+def record_until_silence(max_duration=120, trailing_silence=2.5, start_timeout=15,
+                         threshold_db=VAD_THRESHOLD_DB, sample_rate=SAMPLE_RATE, on_block=None):
+    """Record from the default microphone until the speaker stops talking.
+
+    Stops once ``trailing_silence`` seconds pass without speech after the
+    candidate started, after ``start_timeout`` seconds if they never start, or
+    at ``max_duration``. ``on_block`` (if given) receives each float32 block as
+    it arrives. Returns mono float32 samples with leading/trailing silence trimmed.
+    """
+    # PortAudio initialisation is slow and fails on machines without audio devices
+    import sounddevice as sd
+
+    blocks = queue.Queue()
+
+    def callback(indata, frames, time_info, status):
+        blocks.put(indata[:, 0].copy())
+
+    chunks = []
+    recorded = 0.0
+    speech_frames = 0
+    silent_for = 0.0
+    block_size = int(sample_rate * BLOCK_MS / 1000)
+
+    with sd.InputStream(samplerate=sample_rate, channels=1, dtype="float32",
+                        blocksize=block_size, callback=callback):
+        while recorded < max_duration:
+            block = blocks.get()
+            chunks.append(block)
+            recorded += len(block) / sample_rate
+            if on_block is not None:
+                on_block(block)
+
+            voiced = voiced_frames(block, sample_rate, threshold_db)
+            if voiced.any():
+                speech_frames += int(voiced.sum())
+                # silence since the last voiced frame of this block
+                silent_for = (len(voiced) - 1 - np.flatnonzero(voiced)[-1]) * FRAME_MS / 1000
+            else:
+                silent_for += len(block) / sample_rate
+
+            if speech_frames >= MIN_SPEECH_FRAMES:
+                if silent_for >= trailing_silence:
+                    break
+            elif recorded >= start_timeout:
+                break
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return trim_silence(np.concatenate(chunks), sample_rate, threshold_db)
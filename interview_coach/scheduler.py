@@ -0,0 +1,288 @@
+"""Request scheduling in front of the Gemini API.
+
+Every model call goes through the RequestScheduler of its API key, so the
+sessions sharing a key share its requests/tokens-per-minute budget while
+different keys don't hold each other back. The limiter adapts to the quota
+the API actually grants: each 429 cuts its rate, and successes restore it
+step by step. The scheduler retries transient failures (429, 5xx, timeouts, dropped
+connections) with jittered exponential backoff and, once it has seen enough
+traffic, can hedge a request that runs past a latency percentile by sending
+a duplicate and taking whichever answers first.
+"""
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+
+# 0 disables a limit
+REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_RPM", "60"))
+TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TPM", "1000000"))
+MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1.0"))
+BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "30"))
+# seconds per attempt; also sent to the API as the request deadline
+REQUEST_TIMEOUT = float(os.getenv("GEMINI_REQUEST_TIMEOUT", "60"))
+# hedge requests slower than this latency percentile (0 disables hedging)
+HEDGE_PERCENTILE = float(os.getenv("GEMINI_HEDGE_PERCENTILE", "0"))
+# completed requests needed before the percentile is trusted
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+MAX_CONCURRENT_REQUESTS = int(os.getenv("GEMINI_MAX_CONCURRENT_REQUESTS", "16"))
+# a 429 multiplies the limiter's rate by RATE_BACKOFF; each success adds back
+# RATE_RECOVERY of the configured rate, never going below MIN_RATE_SCALE of it
+RATE_BACKOFF = float(os.getenv("GEMINI_RATE_BACKOFF", "0.5"))
+RATE_RECOVERY = float(os.getenv("GEMINI_RATE_RECOVERY", "0.05"))
+MIN_RATE_SCALE = 0.05
+# API keys whose schedulers are kept (matches the client's GEMINI_MAX_CLIENTS)
+MAX_SCHEDULERS = int(os.getenv("GEMINI_MAX_CLIENTS", "64"))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def is_retryable(error, statuses=RETRYABLE_STATUS):
+    """Transient failures worth another attempt: rate limits, server errors, timeouts, dropped connections"""
+    if isinstance(error, (ConnectionError, TimeoutError, FutureTimeoutError)):
+        return True
+    # google.api_core exceptions carry the HTTP status as ``code``
+    return getattr(error, "code", None) in statuses
+
+
+def is_rate_limited(error):
+    return getattr(error, "code", None) == 429
+
+
+class RateLimiter:
+    """Token buckets for requests and tokens per minute, refilled continuously.
+
+    ``acquire()`` blocks until both budgets allow the request. Output tokens
+    aren't known up front, so they are ``charge()``d afterwards and may leave
+    the token bucket in debt, which delays later requests instead.
+
+    The configured limits are ceilings: ``throttle()`` (on a 429) scales both
+    rates down by ``backoff`` and ``recover()`` (on a success) raises them by
+    ``recovery`` of the ceiling at a time, additive-increase/multiplicative-decrease.
+    """
+
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                 backoff=RATE_BACKOFF, recovery=RATE_RECOVERY):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.backoff = backoff
+        self.recovery = recovery
+        self.scale = 1.0
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self.waited = 0.0
+        self.throttles = 0
+
+    def _rates(self):
+        return self.requests_per_minute * self.scale, self.tokens_per_minute * self.scale
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        requests_rate, tokens_rate = self._rates()
+        self._requests = min(requests_rate, self._requests + elapsed * requests_rate / 60)
+        self._tokens = min(tokens_rate, self._tokens + elapsed * tokens_rate / 60)
+
+    def _wait_time(self, tokens):
+        requests_rate, tokens_rate = self._rates()
+        waits = [0.0]
+        if requests_rate and self._requests < 1:
+            waits.append((1 - self._requests) * 60 / requests_rate)
+        if tokens_rate and self._tokens < tokens:
+            waits.append((tokens - self._tokens) * 60 / tokens_rate)
+        return max(waits)
+
+    def acquire(self, tokens=0, timeout=None):
+        """Take one request and ``tokens`` tokens, waiting up to ``timeout`` seconds (None: no limit)"""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                # a request bigger than the whole budget would otherwise wait forever
+                needed = min(tokens, self._rates()[1]) if self.tokens_per_minute else 0
+                wait_time = self._wait_time(needed)
+                if wait_time == 0:
+                    self._requests -= 1
+                    self._tokens -= needed
+                    self.waited += now - start
+                    return
+                if timeout is not None and now + wait_time > start + timeout:
+                    raise TimeoutError(f"Rate limit would delay this request by {wait_time:.1f}s")
+                self._cond.wait(wait_time)
+
+    def available(self):
+        """Requests that could start right now (0 disables the limit, reported as infinite)"""
+        if not self.requests_per_minute:
+            return float("inf")
+        with self._cond:
+            self._refill(time.monotonic())
+            return self._requests
+
+    def charge(self, tokens):
+        with self._cond:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+
+    def throttle(self):
+        """The API answered 429: lower the rate and spend what's left of the request bucket"""
+        with self._cond:
+            self._refill(time.monotonic())
+            self.scale = max(MIN_RATE_SCALE, self.scale * self.backoff)
+            self._requests = min(self._requests, 0.0)
+            self._tokens = min(self._tokens, self._rates()[1])
+            self.throttles += 1
+
+    def recover(self):
+        """A request succeeded: move the rate back towards the configured limits"""
+        if self.scale >= 1.0:
+            return
+        with self._cond:
+            self._refill(time.monotonic())
+            self.scale = min(1.0, self.scale + self.recovery)
+            self._cond.notify_all()
+
+
+class RequestScheduler:
+    def __init__(self, limiter=None, retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX,
+                 timeout=REQUEST_TIMEOUT, hedge_percentile=HEDGE_PERCENTILE, max_concurrent=MAX_CONCURRENT_REQUESTS,
+                 retry_status=RETRYABLE_STATUS):
+        self.limiter = limiter or RateLimiter()
+        self.retry_status = retry_status
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.hedge_percentile = hedge_percentile
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        # hedged attempts run here rather than on the shared executor, whose
+        # tasks are often the ones waiting for these requests
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="gemini")
+        self.counts = {"requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "failures": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for retry number ``attempt`` (0-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def hedge_delay(self):
+        """Latency at ``hedge_percentile`` over recent requests, or None while hedging is off or warming up"""
+        if not self.hedge_percentile:
+            return None
+        with self._lock:
+            if len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))]
+
+    def call(self, request, tokens=0, timeout=None, hedge=True):
+        """Run ``request(timeout)`` under the rate limit, retrying transient errors.
+
+        ``tokens`` is the prompt's estimated size. ``timeout`` bounds each
+        attempt (default REQUEST_TIMEOUT); ``request`` should pass it on to
+        the API call. Non-retryable errors and the last attempt's error raise.
+        """
+        timeout = timeout or self.timeout
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire(tokens)
+            self._count("requests")
+            start = time.monotonic()
+            try:
+                result = self._attempt(request, tokens, timeout, hedge)
+            except Exception as e:
+                if is_rate_limited(e):
+                    self.limiter.throttle()
+                if attempt == self.retries or not is_retryable(e, self.retry_status):
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                time.sleep(self.backoff(attempt))
+                continue
+            self.limiter.recover()
+            with self._lock:
+                self._latencies.append(time.monotonic() - start)
+            return result
+
+    def _attempt(self, request, tokens, timeout, hedge):
+        delay = self.hedge_delay() if hedge else None
+        if delay is None:
+            return request(timeout)
+
+        primary = self._pool.submit(request, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        try:
+            # hedge only with spare budget; never queue behind the limit for it
+            self.limiter.acquire(tokens, timeout=0)
+        except TimeoutError:
+            return primary.result(timeout=max(0.0, timeout - delay))
+        self._count("hedges")
+        backup = self._pool.submit(request, timeout)
+
+        pending = {primary, backup}
+        error = None
+        deadline = time.monotonic() + timeout
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"No response within {timeout:g}s")
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self._count("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counts)
+            latencies = sorted(self._latencies)
+        stats["rate_limit_wait"] = self.limiter.waited
+        stats["rate_scale"] = self.limiter.scale
+        stats["throttles"] = self.limiter.throttles
+        stats["p50_latency"] = latencies[len(latencies) // 2] if latencies else None
+        stats["hedge_delay"] = self.hedge_delay()
+        return stats
+
+
+_schedulers = OrderedDict()
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(api_key):
+    """Return the scheduler for this API key, shared by every client and session using it.
+
+    Keys are held by hash, and only the MAX_SCHEDULERS most recently used are kept.
+    """
+    digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    with _schedulers_lock:
+        scheduler = _schedulers.get(digest)
+        if scheduler is None:
+            scheduler = RequestScheduler()
+            _schedulers[digest] = scheduler
+            while len(_schedulers) > MAX_SCHEDULERS:
+                # dropped, not shut down: a client may still be using it
+                _schedulers.popitem(last=False)
+        else:
+            _schedulers.move_to_end(digest)
+        return scheduler
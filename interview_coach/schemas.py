@@ -0,0 +1,123 @@
+"""Typed records for structured model output, and their validation."""
+import typing
+from typing import TypedDict
+
+
+class JobAnalysis(TypedDict):
+    job_title: str
+    seniority_level: str
+    technical_skills: list[str]
+    soft_skills: list[str]
+    industry: str
+    experience_years: str
+    team_role: str
+    key_responsibilities: list[str]
+
+
+class GeneratedQuestion(TypedDict):
+    """What the model fills in for each question; see Question for the stored record"""
+    text: str
+    skill: str
+
+
+class Question(TypedDict):
+    text: str
+    type: str
+    difficulty: str
+    skill: str
+
+
+# "try" is a keyword, so this one needs the functional syntax
+PhrasingSuggestion = TypedDict("PhrasingSuggestion", {"instead_of": str, "try": str})
+
+
+class Keyword(TypedDict):
+    keyword: str
+    reason: str
+
+
+class EvaluationRecord(TypedDict):
+    """One answer's evaluation in a batched reply; ``index`` is the answer's position in the interview"""
+    index: int
+    score: int
+    strengths: list[str]
+    areas_for_improvement: list[str]
+    phrasing_suggestions: list[PhrasingSuggestion]
+    keywords: list[Keyword]
+    overall_feedback: str
+
+
+def _check_fields(data, record_type):
+    """Check ``data`` has every field of ``record_type`` with the declared type, raising ValueError"""
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+    record = {}
+    for field, field_type in record_type.__annotations__.items():
+        if field not in data:
+            raise ValueError(f"Missing field: {field}")
+        value = data[field]
+        if field_type is str:
+            if not isinstance(value, str):
+                raise ValueError(f"Field {field} should be a string")
+            value = value.strip()
+        elif field_type == list[str]:
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f"Field {field} should be a list of strings")
+            value = [item.strip() for item in value if item.strip()]
+        elif field_type is int:
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(f"Field {field} should be an integer")
+        elif typing.get_origin(field_type) is list and typing.is_typeddict(typing.get_args(field_type)[0]):
+            if not isinstance(value, list):
+                raise ValueError(f"Field {field} should be a list")
+            value = [_check_fields(item, typing.get_args(field_type)[0]) for item in value]
+        record[field] = value
+    return record
+
+
+def parse_job_analysis(data):
+    """Validate a decoded analysis reply into a JobAnalysis, raising ValueError if it doesn't fit"""
+    record = _check_fields(data, JobAnalysis)
+    if not record["job_title"]:
+        raise ValueError("Empty job title")
+    record["seniority_level"] = record["seniority_level"].lower()
+    return JobAnalysis(**record)
+
+
+def parse_questions(data, question_type, difficulty):
+    """Turn a decoded list of GeneratedQuestion into Question records.
+
+    Malformed or empty items are dropped rather than failing the whole reply,
+    so the caller can top up just the missing count.
+    """
+    if not isinstance(data, list):
+        raise ValueError(f"Expected a JSON array, got {type(data).__name__}")
+    questions = []
+    for item in data:
+        try:
+            record = _check_fields(item, GeneratedQuestion)
+        except ValueError:
+            continue
+        if record["text"]:
+            questions.append(Question(text=record["text"], type=question_type, difficulty=difficulty,
+                                      skill=record["skill"]))
+    return questions
+
+
+def parse_evaluations(data):
+    """Turn a decoded list of EvaluationRecord into ``{index: evaluation}``.
+
+    Malformed items and out-of-range scores are dropped, so the caller can
+    report exactly which answers went unevaluated.
+    """
+    if not isinstance(data, list):
+        raise ValueError(f"Expected a JSON array, got {type(data).__name__}")
+    evaluations = {}
+    for item in data:
+        try:
+            record = _check_fields(item, EvaluationRecord)
+        except ValueError:
+            continue
+        if 0 <= record["score"] <= 10:
+            evaluations[record["index"]] = EvaluationRecord(**record)
+    return evaluations
@@ -0,0 +1,307 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from interview_coach.cache import CACHE_DIR
+
+
+SPEECH_CACHE_DIR = os.path.join(CACHE_DIR, "speech")
+MEMORY_ITEMS = int(os.getenv("SPEECH_CACHE_MEMORY_ITEMS", "64"))
+DISK_ITEMS = int(os.getenv("SPEECH_CACHE_DISK_ITEMS", "500"))
+# backends in order of preference, e.g. "espeak,gtts" for offline-first deployments
+TTS_BACKENDS = os.getenv("TTS_BACKENDS", "gtts,espeak")
+# a backend slower than this (moving average, seconds) gives way to a faster one
+TTS_LATENCY_BUDGET = float(os.getenv("TTS_LATENCY_BUDGET", "2.0"))
+TTS_FAILURE_COOLDOWN = float(os.getenv("TTS_FAILURE_COOLDOWN", "60"))
+# synthesis gets its own small pool so a prefetch never queues ahead of model calls on the shared executor
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", "2"))
+
+# ``backend`` is the name of the TTS backend that produced the audio (None when read from disk)
+SpeechAudio = namedtuple("SpeechAudio", ["data", "format", "backend"], defaults=(None,))
+AUDIO_FORMATS = ("mp3", "wav")
+
+
+def speech_key(text, lang):
+    return hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).hexdigest()
+
+
+class SpeechCache:
+    """Synthesized audio keyed by (text, lang): a small in-memory LRU over a bounded directory.
+
+    Entries put with ``persist=False`` stay in memory only, for ``ttl`` seconds.
+    """
+
+    def __init__(self, directory=SPEECH_CACHE_DIR, memory_items=MEMORY_ITEMS, disk_items=DISK_ITEMS):
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self.directory = directory
+        except OSError:
+            self.directory = None
+
+    def path(self, key, audio_format):
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{key}.{audio_format}")
+
+    def get(self, key, formats=AUDIO_FORMATS):
+        """Cached audio for ``key``; on disk only files in one of ``formats`` count"""
+        with self._lock:
+            if key in self._memory:
+                audio, expires = self._memory[key]
+                if expires is None or expires > time.monotonic():
+                    self._memory.move_to_end(key)
+                    return audio
+                del self._memory[key]
+
+        for audio_format in formats:
+            path = self.path(key, audio_format)
+            if path is None or not os.path.exists(path):
+                continue
+            try:
+                with open(path, "rb") as f:
+                    audio = SpeechAudio(f.read(), audio_format)
+            except OSError:
+                continue
+            self._remember(key, audio)
+            return audio
+        return None
+
+    def put(self, key, audio, persist=True, ttl=None):
+        self._remember(key, audio, None if persist or ttl is None else time.monotonic() + ttl)
+        path = self.path(key, audio.format)
+        if path is None or not persist:
+            return
+        try:
+            # write-then-rename so a concurrent reader never sees half a file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio.data)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError:
+            pass
+
+    def _remember(self, key, audio, expires=None):
+        with self._lock:
+            self._memory[key] = (audio, expires)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(AUDIO_FORMATS)]
+        if len(entries) <= self.disk_items:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.disk_items]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+class GTTSBackend:
+    """Google Translate TTS: natural voices, one network round-trip per question"""
+
+    name = "gtts"
+    format = "mp3"
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+
+        tts = gTTS(text=text, lang=lang, slow=False)
+        audio_buffer = BytesIO()
+        tts.write_to_fp(audio_buffer)
+        return audio_buffer.getvalue()
+
+
+class EspeakBackend:
+    """Offline synthesis with the espeak-ng (or espeak) command line tool"""
+
+    name = "espeak"
+    format = "wav"
+
+    def __init__(self):
+        self.executable = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self):
+        return self.executable is not None
+
+    def synthesize(self, text, lang):
+        result = subprocess.run(
+            [self.executable, "-v", lang, "--stdout", text],
+            capture_output=True, check=True, timeout=30,
+        )
+        return result.stdout
+
+
+BACKENDS = {
+    "gtts": GTTSBackend,
+    "espeak": EspeakBackend,
+}
+
+
+class SpeechSynthesizer:
+    """Picks a TTS backend per request from the configured ones.
+
+    Backends are tried in preference order, except that a backend whose
+    moving-average latency is over ``latency_budget`` is tried after those
+    within budget, and one that just failed is skipped for ``cooldown`` seconds.
+    """
+
+    def __init__(self, backends, latency_budget=TTS_LATENCY_BUDGET, cooldown=TTS_FAILURE_COOLDOWN):
+        self.backends = [backend for backend in backends if backend.available()]
+        self.latency_budget = latency_budget
+        self.cooldown = cooldown
+        self._latency = {}
+        self._failed_at = {}
+        self._lock = threading.Lock()
+
+    def candidates(self):
+        now = time.monotonic()
+        with self._lock:
+            def rank(item):
+                position, backend = item
+                cooling = now - self._failed_at.get(backend.name, float("-inf")) < self.cooldown
+                slow = self._latency.get(backend.name, 0.0) > self.latency_budget
+                return (cooling, slow, position)
+            return [backend for _, backend in sorted(enumerate(self.backends), key=rank)]
+
+    def synthesize(self, text, lang="en"):
+        errors = []
+        for backend in self.candidates():
+            start = time.monotonic()
+            try:
+                data = backend.synthesize(text, lang)
+            except Exception as e:
+                with self._lock:
+                    self._failed_at[backend.name] = time.monotonic()
+                errors.append(f"{backend.name}: {e}")
+                continue
+            elapsed = time.monotonic() - start
+            with self._lock:
+                previous = self._latency.get(backend.name)
+                self._latency[backend.name] = elapsed if previous is None else 0.7 * previous + 0.3 * elapsed
+            return SpeechAudio(data, backend.format, backend.name)
+        raise RuntimeError("No text-to-speech backend succeeded: " + ("; ".join(errors) or "none available"))
+
+    @property
+    def preferred(self):
+        """The first configured backend that's available: the only one whose audio is kept on disk"""
+        return self.backends[0] if self.backends else None
+
+    def stats(self):
+        with self._lock:
+            return {backend.name: self._latency.get(backend.name) for backend in self.backends}
+
+
+def create_synthesizer(names=TTS_BACKENDS):
+    backends = []
+    for name in names.split(","):
+        name = name.strip()
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown TTS backend: {name}")
+        backends.append(BACKENDS[name]())
+    return SpeechSynthesizer(backends)
+
+
+_cache = None
+_synthesizer = None
+_singletons_lock = threading.Lock()
+_pending = {}
+_pending_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+
+
+def get_speech_cache():
+    """Return the process-wide speech cache, creating its directory on first use"""
+    global _cache
+    if _cache is None:
+        with _singletons_lock:
+            if _cache is None:
+                _cache = SpeechCache()
+    return _cache
+
+
+def get_synthesizer():
+    """Return the process-wide synthesizer for TTS_BACKENDS (an unknown name raises ValueError here)"""
+    global _synthesizer
+    if _synthesizer is None:
+        with _singletons_lock:
+            if _synthesizer is None:
+                _synthesizer = create_synthesizer()
+    return _synthesizer
+
+
+def synthesize(text, lang="en"):
+    return get_synthesizer().synthesize(text, lang)
+
+
+def _cached_audio(key):
+    """Cached audio for ``key``, ignoring files another (e.g. fallback) backend wrote to disk"""
+    preferred = get_synthesizer().preferred
+    return get_speech_cache().get(key, (preferred.format,) if preferred else AUDIO_FORMATS)
+
+
+def _synthesize_and_store(key, text, lang):
+    audio = synthesize(text, lang)
+    preferred = get_synthesizer().preferred
+    # a fallback's audio is only kept until the preferred backend is due to be retried
+    persist = preferred is not None and audio.backend == preferred.name
+    get_speech_cache().put(key, audio, persist=persist, ttl=TTS_FAILURE_COOLDOWN)
+    return audio
+
+
+def _request(key, text, lang):
+    """Synthesize in the background, sharing one job between concurrent requests for the same audio"""
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is None:
+            future = _executor.submit(_synthesize_and_store, key, text, lang)
+            _pending[key] = future
+            future.add_done_callback(lambda _: _pending.pop(key, None))
+    return future
+
+
+def get_question_audio(text, lang="en"):
+    """Return SpeechAudio for ``text``, synthesizing only on a cache miss"""
+    key = speech_key(text, lang)
+    audio = _cached_audio(key)
+    if audio is not None:
+        return audio
+    return _request(key, text, lang).result()
+
+
+def get_question_audio_path(text, lang="en"):
+    """Like get_question_audio() but returns a file path, for players that need one"""
+    audio = get_question_audio(text, lang)
+    path = get_speech_cache().path(speech_key(text, lang), audio.format)
+    if path is None or not os.path.exists(path):
+        fd, path = tempfile.mkstemp(suffix=f".{audio.format}")
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio.data)
+    return path
+
+
+def prefetch(texts, lang="en"):
+    """Start synthesizing every text that isn't cached yet"""
+    futures = []
+    for text in texts:
+        key = speech_key(text, lang)
+        if _cached_audio(key) is None:
+            futures.append(_request(key, text, lang))
+    return futures
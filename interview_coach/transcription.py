@@ -0,0 +1,358 @@
+import io
+import multiprocessing
+import os
+import threading
+import wave
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from interview_coach.audio import FRAME_MS, SAMPLE_RATE, frame_energy, load_audio, voiced_frames
+
+
+MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
+DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WORKERS = int(os.getenv("WHISPER_WORKERS", "2"))
+MAX_PENDING = int(os.getenv("WHISPER_MAX_PENDING", "16"))
+# silence lead-in kept in front of speech when the open window is still quiet
+LEAD_IN_SECONDS = 0.3
+# answers at least this long are split at pauses and transcribed across processes
+PARALLEL_MIN_SECONDS = float(os.getenv("WHISPER_PARALLEL_MIN_SECONDS", "60"))
+# opt-in: each process loads its own Whisper model, so this trades memory for
+# speed on long answers; measure with benchmarks/bench_parallel_transcription.py
+PARALLEL_PROCESSES = int(os.getenv("WHISPER_PROCESSES", "0"))
+SEGMENT_SECONDS = float(os.getenv("WHISPER_SEGMENT_SECONDS", "30"))
+
+Segment = namedtuple("Segment", ["start", "end", "text"])
+Transcript = namedtuple("Transcript", ["text", "segments", "duration"])
+
+
+def _faster_whisper():
+    """faster-whisper pulls in CTranslate2 and PyAV, so only import it when a model is needed"""
+    import faster_whisper
+    return faster_whisper
+
+
+class TranscriptionBusyError(RuntimeError):
+    """Raised when the transcription queue is full"""
+
+
+class TranscriptionEngine:
+    """A single Whisper model shared by every caller in the process.
+
+    Jobs run on a small worker pool and at most ``max_pending`` jobs can be
+    queued or running at once, so a burst of users can't pile up unbounded work.
+    """
+
+    def __init__(self, model_size=MODEL_SIZE, device=DEVICE, compute_type=COMPUTE_TYPE,
+                 workers=WORKERS, max_pending=MAX_PENDING, processes=PARALLEL_PROCESSES):
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.workers = workers
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._prewarm_future = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._parallel = None
+        if processes > 1:
+            self._parallel = ParallelTranscriber(processes, model_size, device, compute_type)
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def load(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    # num_workers lets faster-whisper serve one transcribe() per pool thread
+                    self._model = _faster_whisper().WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        compute_type=self.compute_type,
+                        num_workers=self.workers,
+                    )
+        return self._model
+
+    def prewarm(self):
+        """Start loading the model in the background (only once)"""
+        with self._load_lock:
+            if self._prewarm_future is None:
+                # the worker processes start with the first long answer, not here
+                self._prewarm_future = self._executor.submit(self.load)
+            return self._prewarm_future
+
+    def submit(self, audio, sample_rate=None, queue_timeout=None, detailed=False, **options):
+        """Queue a transcription and return a Future resolving to the text.
+
+        ``audio`` may be a file path, encoded audio bytes (WAV is decoded in
+        memory) or a sample array recorded at ``sample_rate``. With
+        ``detailed=True`` the Future resolves to a Transcript with timestamps.
+        """
+        if queue_timeout is None:
+            acquired = self._slots.acquire()
+        else:
+            acquired = self._slots.acquire(timeout=queue_timeout)
+        if not acquired:
+            raise TranscriptionBusyError("Transcription queue is full, please try again")
+
+        try:
+            future = self._executor.submit(self._transcribe, audio, sample_rate, detailed, options)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def transcribe(self, audio, sample_rate=None, timeout=None, detailed=False, **options):
+        future = self.submit(audio, sample_rate, queue_timeout=timeout, detailed=detailed, **options)
+        return future.result(timeout=timeout)
+
+    def _transcribe(self, audio, sample_rate, detailed, options):
+        samples = prepare_audio(audio, sample_rate)
+        duration = len(samples) / SAMPLE_RATE
+        if self._parallel is not None and duration >= PARALLEL_MIN_SECONDS:
+            segments = self._parallel.transcribe_segments(samples, options)
+        else:
+            segments = _to_segments(self.load().transcribe(samples, **options)[0])
+
+        transcript = Transcript(" ".join(segment.text for segment in segments), segments, duration)
+        return transcript if detailed else transcript.text
+
+
+def _to_segments(whisper_segments, offset=0.0):
+    return [
+        Segment(offset + segment.start, offset + segment.end, segment.text.strip())
+        for segment in whisper_segments
+        if segment.text.strip()
+    ]
+
+
+def split_on_pauses(samples, sample_rate=SAMPLE_RATE, segment_seconds=SEGMENT_SECONDS):
+    """Return (start, end) sample ranges about ``segment_seconds`` long, cut at the quietest
+    point (smoothed over ~300 ms) within a quarter segment of each target boundary"""
+    energy = frame_energy(samples, sample_rate)
+    if len(energy) == 0:
+        return [(0, len(samples))]
+    energy = np.convolve(energy, np.ones(10) / 10, mode="same")
+    frame = int(sample_rate * FRAME_MS / 1000)
+    target = int(segment_seconds * 1000 / FRAME_MS)
+    search = target // 4
+
+    cuts = [0]
+    while cuts[-1] + target + search < len(energy):
+        low = cuts[-1] + target - search
+        cuts.append(low + int(np.argmin(energy[low:cuts[-1] + target + search])))
+
+    bounds = [cut * frame for cut in cuts] + [len(samples)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+_worker_model = None
+
+
+def _load_worker_model(model_size, device, compute_type, cpu_threads):
+    global _worker_model
+    _worker_model = _faster_whisper().WhisperModel(
+        model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads
+    )
+
+
+def _transcribe_chunk(samples, offset, options):
+    return _to_segments(_worker_model.transcribe(samples, **options)[0], offset)
+
+
+class ParallelTranscriber:
+    """Transcribes long audio as pause-aligned chunks on a pool of processes.
+
+    Every process loads its own model (``cpu_count / processes`` threads each),
+    so chunks decode in parallel instead of one after another; segment
+    timestamps are shifted back by each chunk's offset and kept in order.
+    """
+
+    def __init__(self, processes, model_size=MODEL_SIZE, device=DEVICE, compute_type=COMPUTE_TYPE,
+                 segment_seconds=SEGMENT_SECONDS):
+        self.processes = processes
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.segment_seconds = segment_seconds
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                cpu_threads = max(1, (os.cpu_count() or 1) // self.processes)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    # CTranslate2 holds threads, which don't survive fork()
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_load_worker_model,
+                    initargs=(self.model_size, self.device, self.compute_type, cpu_threads),
+                )
+            return self._pool
+
+    def prewarm(self):
+        """Start every worker process so their models load now (benchmarks use this to exclude load time)"""
+        pool = self._get_pool()
+        return [pool.submit(int) for _ in range(self.processes)]
+
+    def transcribe_segments(self, samples, options=None):
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_transcribe_chunk, samples[start:end], start / SAMPLE_RATE, options or {})
+            for start, end in split_on_pauses(samples, SAMPLE_RATE, self.segment_seconds)
+        ]
+        return [segment for future in futures for segment in future.result()]
+
+    def transcribe(self, samples, **options):
+        segments = self.transcribe_segments(samples, options)
+        return Transcript(" ".join(segment.text for segment in segments), segments, len(samples) / SAMPLE_RATE)
+
+
+def prepare_audio(audio, sample_rate=None):
+    """Decode any supported input into 16 kHz mono float32 samples, in memory"""
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        try:
+            return load_audio(audio)
+        except (wave.Error, EOFError):
+            # not a WAV file, let faster-whisper's decoder handle it from memory
+            return _faster_whisper().decode_audio(io.BytesIO(audio), sampling_rate=SAMPLE_RATE)
+    if isinstance(audio, np.ndarray):
+        return load_audio(audio, sample_rate)
+    return _faster_whisper().decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+
+class StreamingTranscriber:
+    """Transcribes an answer while it is still being recorded.
+
+    Audio arrives through feed(). The open window is closed at a pause of
+    ``pause`` seconds (or once it reaches ``max_window`` seconds) and sent to
+    the engine; that text is final. While speech continues, the open window is
+    re-transcribed every ``partial_interval`` seconds and ``on_partial`` gets
+    the transcript so far. finish() then only waits for the last short window.
+    """
+
+    def __init__(self, engine=None, sample_rate=SAMPLE_RATE, partial_interval=2.0, pause=0.6,
+                 max_window=20.0, on_partial=None):
+        self.engine = engine or get_engine()
+        self.sample_rate = sample_rate
+        self.partial_interval = partial_interval
+        self.pause = pause
+        self.max_window = max_window
+        self.on_partial = on_partial
+        self._committed = []
+        self._window = []
+        self._window_seconds = 0.0
+        self._window_has_speech = False
+        self._silent_for = 0.0
+        self._since_partial = 0.0
+        self._partial = None
+        self._lock = threading.Lock()
+
+    def feed(self, block):
+        block = load_audio(block, self.sample_rate)
+        seconds = len(block) / SAMPLE_RATE
+        self._window.append(block)
+        self._window_seconds += seconds
+        self._since_partial += seconds
+
+        voiced = voiced_frames(block, SAMPLE_RATE)
+        if voiced.any():
+            self._window_has_speech = True
+            self._silent_for = (len(voiced) - 1 - np.flatnonzero(voiced)[-1]) * FRAME_MS / 1000
+        else:
+            self._silent_for += seconds
+
+        if not self._window_has_speech:
+            self._drop_leading_silence()
+        elif self._silent_for >= self.pause or self._window_seconds >= self.max_window:
+            self._commit()
+        elif self._since_partial >= self.partial_interval:
+            self._request_partial()
+
+    def _drop_leading_silence(self):
+        audio = np.concatenate(self._window)
+        keep = int(LEAD_IN_SECONDS * SAMPLE_RATE)
+        self._window = [audio[-keep:]]
+        self._window_seconds = len(self._window[0]) / SAMPLE_RATE
+
+    def _take_window(self):
+        audio = np.concatenate(self._window)
+        self._window = []
+        self._window_seconds = 0.0
+        self._window_has_speech = False
+        self._since_partial = 0.0
+        return audio
+
+    def _commit(self):
+        future = self.engine.submit(self._take_window(), SAMPLE_RATE)
+        with self._lock:
+            self._committed.append(future)
+            self._partial = None
+        future.add_done_callback(lambda _: self._emit())
+
+    def _request_partial(self):
+        self._since_partial = 0.0
+        with self._lock:
+            if self._partial is not None and not self._partial.done():
+                return
+        try:
+            # never queue behind other users just for a preview
+            future = self.engine.submit(np.concatenate(self._window), SAMPLE_RATE, queue_timeout=0)
+        except TranscriptionBusyError:
+            return
+        with self._lock:
+            self._partial = future
+        future.add_done_callback(lambda done: self._emit(done))
+
+    def _emit(self, partial=None):
+        if self.on_partial is None:
+            return
+        self.on_partial(self.text(partial))
+
+    def text(self, partial=None):
+        """Transcript so far: every finished window in order, plus the latest preview"""
+        parts = []
+        with self._lock:
+            committed = list(self._committed)
+            current_partial = self._partial
+        for future in committed:
+            if not future.done():
+                return " ".join(parts)
+            if future.exception() is None:
+                parts.append(future.result())
+        if partial is not None and partial is current_partial and partial.exception() is None:
+            parts.append(partial.result())
+        return " ".join(part for part in parts if part)
+
+    def finish(self, timeout=None):
+        """Close the last window and return the full transcript"""
+        if self._window_has_speech:
+            self._commit()
+        with self._lock:
+            committed = list(self._committed)
+        return " ".join(text for text in (future.result(timeout=timeout) for future in committed) if text)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide transcription engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TranscriptionEngine()
+    return _engine
+
+
+def prewarm():
+    return get_engine().prewarm()
@@ -1,307 +1,93 @@
-import whisper
-import sounddevice as sd
-import numpy as np
-from scipy.io.wavfile import write
-import google.generativeai as genai
-import json
-import re
 from dotenv import load_dotenv
+import argparse
+import json
 import os
-from gtts import gTTS
+import shlex
+import sys
+import time
+
+from interview_coach import batch, pipeline, speech, transcription
+from interview_coach.analytics import summarize_evaluations
+from interview_coach.audio import SAMPLE_RATE
+from interview_coach.delivery import MONOTONE_SEMITONES, analyze_delivery
+from interview_coach.evaluation import format_evaluation
+from interview_coach.keys import POOLED, get_pool
+from interview_coach.prescoring import prescore_answer
+from interview_coach.recording import record_until_silence
 
 
 load_dotenv()
-api_key = os.getenv('GEMINI_API_KEY')
-
-jd_analysis_prompt = """
-Analyze this job description and extract key information. Return your response as a valid JSON object with no extra text or formatting.
-
-Job Profile: {job_profile}
-Job Description: {job_description}
-
-Return EXACTLY this JSON structure with actual values filled in:
-{{
-  "job_title": "exact title from posting",
-  "seniority_level": "entry/mid/senior/lead",
-  "technical_skills": ["skill1", "skill2"],
-  "soft_skills": ["skill1", "skill2"],
-  "industry": "industry type",
-  "experience_years": "X-Y years or not specified",
-  "team_role": "individual_contributor/team_lead/manager",
-  "key_responsibilities": ["responsibility1", "responsibility2"]
-}}
-
-IMPORTANT: Return ONLY the JSON object, no explanations or additional text.
-"""
-def create_behavioral_prompt(job_analysis, count, difficulty="easy"):
-    """Create prompt for behavioral questions with difficulty"""
-    
-    job_title = job_analysis.get('job_title', 'the position')
-    seniority = job_analysis.get('seniority_level', 'mid-level')
-    soft_skills = job_analysis.get('soft_skills', [])
-    responsibilities = job_analysis.get('key_responsibilities', [])
-    
-    # Difficulty-specific requirements
-    difficulty_requirements = {
-        "easy": """
-- Focus on basic workplace scenarios and learning experiences
-- Ask about simple challenges and how they overcame them
-- Questions about teamwork and communication at entry level
-- Example: "Tell me about a time you had to learn something new quickly"
-        """,
-        "medium": """
-- Focus on project ownership and cross-team collaboration  
-- Ask about handling competing priorities and difficult decisions
-- Questions about leadership moments and conflict resolution
-- Example: "Describe a time you had to manage multiple stakeholders with different priorities"
-        """,
-        "hard": """
-- Focus on strategic decision-making and organizational impact
-- Ask about leading through crisis and complex problem-solving
-- Questions about mentoring, architecture decisions, and business impact
-- Example: "Tell me about a time you had to make a critical decision that affected the entire organization"
-        """
-    }
-    
-    prompt = f"""
-Generate {count} behavioral interview questions for a {job_title} position at {seniority} level.
-
-DIFFICULTY LEVEL: {difficulty.upper()}
-{difficulty_requirements[difficulty]}
-
-Focus on these soft skills: {', '.join(soft_skills)}
-Key responsibilities: {', '.join(responsibilities)}
-
-Requirements for each question:
-1. Use STAR method (Situation, Task, Action, Result)
-2. Match {difficulty} difficulty level complexity
-3. Be specific to this role and seniority level
-4. Test real workplace scenarios appropriate for {difficulty} level
-5. Be answerable in 2-3 minutes
-
-Format your response as:
-1. [First question]
-2. [Second question]
-3. [Third question]
-etc.
-
-Generate ONLY the numbered questions, no additional text.
-"""
-    return prompt
-
-
-def create_technical_prompt(job_analysis, count, difficulty="easy"):
-    """Create prompt for technical questions with difficulty"""
-    
-    job_title = job_analysis.get('job_title', 'the position')
-    seniority = job_analysis.get('seniority_level', 'mid-level')
-    technical_skills = job_analysis.get('technical_skills', [])
-    
-    difficulty_requirements = {
-        "easy": """
-- Focus on fundamental concepts and basic implementation
-- Ask about simple coding problems and basic system understanding
-- Test core technology knowledge without complex scenarios
-- Example: "How would you implement a basic REST API endpoint?"
-        """,
-        "medium": """
-- Focus on practical problem-solving and best practices
-- Ask about debugging, optimization, and design patterns
-- Test ability to explain trade-offs and handle moderate complexity
-- Example: "How would you optimize a slow database query and what factors would you consider?"
-        """,
-        "hard": """
-- Focus on system design, architecture, and complex problem-solving
-- Ask about scalability, distributed systems, and technical leadership
-- Test ability to design solutions and make architectural decisions
-- Example: "Design a distributed system to handle 1 million concurrent users with 99.9% uptime"
-        """
-    }
-    
-    prompt = f"""
-Generate {count} technical interview questions for a {job_title} position at {seniority} level.
-
-DIFFICULTY LEVEL: {difficulty.upper()}
-{difficulty_requirements[difficulty]}
-
-Required technical skills: {', '.join(technical_skills)}
-
-Requirements for each question:
-1. Match {difficulty} difficulty level complexity
-2. Focus on practical application appropriate for {difficulty} level
-3. Can be answered in 2-3 minutes
-4. Test real-world problem-solving at {difficulty} level
-5. Specific to the required technologies
-
-Format your response as:
-1. [First question]
-2. [Second question]
-3. [Third question]
-etc.
-
-Generate ONLY the numbered questions, no additional text.
-"""
-    return prompt
-
-def create_situational_prompt(job_analysis, count, difficulty="easy"):
-    """Create prompt for situational questions with difficulty"""
-    
-    job_title = job_analysis.get('job_title', 'the position')
-    industry = job_analysis.get('industry', 'technology')
-    team_role = job_analysis.get('team_role', 'individual_contributor')
-    
-    difficulty_requirements = {
-        "easy": """
-- Focus on individual contributor scenarios and basic professional situations
-- Ask about learning from mistakes and asking for help
-- Simple conflict resolution and priority management
-- Example: "What would you do if you realized you made an error that affected your team?"
-        """,
-        "medium": """
-- Focus on project ownership and cross-team collaboration
-- Ask about managing competing demands and difficult conversations
-- Moderate stakeholder management and team coordination
-- Example: "How would you handle conflicting requirements from two different departments?"
-        """,
-        "hard": """
-- Focus on organizational leadership and strategic decision-making
-- Ask about crisis management and transformational change
-- Complex stakeholder management and business-critical decisions
-- Example: "What would you do if you had to lead a critical project with unclear requirements and tight deadlines?"
-        """
-    }
-    
-    prompt = f"""
-Generate {count} situational interview questions for a {job_title} in {industry} industry.
-
-DIFFICULTY LEVEL: {difficulty.upper()}
-{difficulty_requirements[difficulty]}
-
-Team role: {team_role}
-
-Requirements for each question:
-1. Present realistic workplace scenarios for {difficulty} level
-2. Test decision-making appropriate for {difficulty} complexity
-3. Match the responsibility level and industry context
-4. Start with "What would you do if..." or "How would you handle..."
-5. Be specific to the work environment
-
-Format your response as:
-1. [First question]
-2. [Second question]
-3. [Third question]
-etc.
-
-Generate ONLY the numbered questions, no additional text.
-"""
-    return prompt
+# an operator key pool (GEMINI_API_KEYS) takes precedence over a single key
+api_key = POOLED if get_pool() else os.getenv('GEMINI_API_KEY')
 
-def job_description_analysis(job_description, job_profile):
-    try:
-        genai.configure(api_key=api_key)
-        model=genai.GenerativeModel('gemini-2.5-flash')
+MAX_ANSWER_SECONDS = int(os.getenv("MAX_ANSWER_SECONDS", "120"))
+TRAILING_SILENCE_SECONDS = float(os.getenv("TRAILING_SILENCE_SECONDS", "2.5"))
 
-        formatted_prompt=jd_analysis_prompt.format(
-            job_profile=job_profile,
-            job_description=job_description
-        )
 
+def job_description_analysis(job_description, job_profile):
+    try:
         print("Analyzing Your Job Decription...")
-        response=model.generate_content(formatted_prompt)
-
-        json_data= extract_json_from_response(response.text)
+        json_data = pipeline.analyze_job_description(api_key, job_description, job_profile)
+        print("Job Analysis Complete!")
+        return json_data
 
-        if(json_data):
-            print("Job Analysis Complete!")
-            return json_data
-        else:
-            print("Failed to extract any valid data")
-            return None
-        
     except Exception as e:
         print(f"Error analysing job description: {e}")
         return None
 
-def extract_json_from_response(json_content):
-    try:
-        json_match = re.search(r'\{.*\}', json_content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            return json.loads(json_str)
-        else:
-            return json.loads(json_content)
-    except json.JSONDecodeError as e:
-        print(f"JSON parsing error: {e}")
-        print(f"Response was: {json_content}")
-        return None
-    
-def generate_questions(job_data, question_type="behavioral", count=5, difficulty="easy"):
-    try:
-        genai.configure(api_key=api_key)
-        model=genai.GenerativeModel('gemini-2.5-flash')
-
-        if(question_type=="behavioral"):
-            prompt=create_behavioral_prompt(job_data,count,difficulty)
-        elif(question_type=="technical"):
-            prompt=create_technical_prompt(job_data,count,difficulty)
-        elif(question_type=="situational"):
-            prompt=create_situational_prompt(job_data,count,difficulty)
-        else:
-            print(f"Unknown question type: {question_type}")
-            return None
-        
-        response=model.generate_content(prompt)
-        
-        questions = parse_questions_response(response.text)
-        if questions:
-            return questions
-        else:
-            print("❌ Failed to parse questions from response")
-            return None
-            
-    except Exception as e:
-        print(f"Error generating questions: {e}")
-        return None
-
-def parse_questions_response(response_text):
-    try:
-        questions = []
-        lines = response_text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            
-            if re.match(r'^\d+\.\s+', line):
-                question = re.sub(r'^\d+\.\s+', '', line)
-                if question: 
-                    questions.append(question)
-        
-        return questions if questions else None
-        
-    except Exception as e:
-        print(f"Error parsing questions: {e}")
-        return None
-
-
-def record_voice(filename, duration=5, samplerate=44100):
-    print(f"Recording for {duration} seconds ...")
-    audio_data=sd.rec(
-        int(samplerate * duration), samplerate=samplerate, channels=1, dtype='int16'
-    )
-    sd.wait()
-    write(filename, samplerate, audio_data)
-    print("Audio recording complete!")
-    # models = ["tiny", "base", "small", "medium", "large"]
-    model = whisper.load_model("small")
-    result = model.transcribe(filename)
-    return result["text"]
+def generate_question_sets(job_data, counts, difficulty="easy", timeout=pipeline.GENERATION_TIMEOUT, use_cache=True):
+    """Generate all question categories concurrently, keeping the QUESTION_TYPES order"""
+    print("Generating questions...")
+    questions, errors = pipeline.generate_question_sets(api_key, job_data, counts, difficulty, timeout, use_cache)
+    for question_type, error in errors.items():
+        print(f"❌ Error generating {question_type} questions: {error}")
+    return questions
+
+
+def show_partial_transcript(text):
+    print(f"\r📝 {text[-100:]}", end="", flush=True)
+
+
+def record_voice(max_duration=MAX_ANSWER_SECONDS, trailing_silence=TRAILING_SILENCE_SECONDS):
+    print(f"Recording... (stops after {trailing_silence:g}s of silence, at most {max_duration}s)")
+    # transcribe while the candidate is still talking
+    transcriber=transcription.StreamingTranscriber(on_partial=show_partial_transcript)
+    audio_data=record_until_silence(max_duration, trailing_silence, on_block=transcriber.feed)
+    text=transcriber.finish()
+    print("\nAudio recording complete!")
+    if len(audio_data)==0:
+        print("No speech detected")
+        return "", audio_data
+    return text, audio_data
+
+
+def show_prescore(prescore):
+    if prescore["words_per_minute"] is not None:
+        print(f"Pace: {prescore['words_per_minute']:.0f} words/min ({prescore['pace']})")
+    print(f"Filler words: {prescore['filler_count']} ({prescore['filler_rate']:.1f} per 100 words)")
+    if prescore["star"] is not None:
+        print("STAR structure: " + ", ".join(
+            f"{part} {'yes' if present else 'missing'}" for part, present in prescore["star"].items()
+        ))
+    if prescore["skill_coverage"] is not None:
+        print(f"Skills mentioned: {', '.join(prescore['skills_mentioned']) or 'none'} "
+              f"({prescore['skill_coverage']:.0%} of the job's skills)")
+
+
+def show_delivery(delivery):
+    if delivery is None:
+        return
+    print(f"Speaking time: {delivery['speaking_ratio']:.0%}, pauses: {delivery['pause_count']} "
+          f"(longest {delivery['longest_pause']:.1f}s)")
+    if delivery["pitch_variability"] is not None:
+        flat = " - try varying your tone" if delivery["pitch_variability"] < MONOTONE_SEMITONES else ""
+        print(f"Pitch variation: {delivery['pitch_variability']:.1f} semitones{flat}")
 
 
 def speak_question_simple(text, lang='en'):
     try:
-        tts = gTTS(text=text, lang=lang)
-        tts.save("question_audio.mp3")
-        os.system("afplay question_audio.mp3")  
+        audio_path = speech.get_question_audio_path(text, lang)
+        os.system(f"afplay {shlex.quote(audio_path)}")  
         
         print("✅ Question audio saved and playing!")
         
@@ -311,109 +97,109 @@ def speak_question_simple(text, lang='en'):
 def interview(job_data, behavioral_question_count=1, technical_question_count=1, situational_question_count=1, difficulty="easy"):
     try:
         answer=[]
-        questions=[]
-        #get behvioral questions, record answers and append them to answers list
-        if(behavioral_question_count!=0):
-            behavioral_questions=generate_questions(job_data, "behavioral", behavioral_question_count, difficulty)
-            n1=len(behavioral_questions)
-            for i in range(0,n1):
-                questions.append(behavioral_questions[i])
-                print(behavioral_questions[i])
-                speak_question_simple(behavioral_questions[i])
-                answer.append(record_voice("answer.wav",20))
-
-        #get technical questions, record answers and append them to answers list
-        if(technical_question_count!=0):
-            technical_questions=generate_questions(job_data, "technical", technical_question_count,difficulty)
-            n2=len(technical_questions)
-            for i in range(0,n2):
-                questions.append(technical_questions[i])
-                print(technical_questions[i])
-                speak_question_simple(technical_questions[i])
-                answer.append(record_voice("answer.wav",20))
-        
-        #get technical questions, record answers and append them to answers list
-        if(situational_question_count!=0):
-            situational_questions=generate_questions(job_data, "situational", situational_question_count,difficulty)
-            n3=len(situational_questions)
-            for i in range(0,n3):
-                questions.append(situational_questions[i])
-                print(situational_questions[i])
-                speak_question_simple(situational_questions[i])
-                answer.append(record_voice("answer.wav",20))
+        question_records = generate_question_sets(
+            job_data,
+            {
+                "behavioral": behavioral_question_count,
+                "technical": technical_question_count,
+                "situational": situational_question_count,
+            },
+            difficulty
+        )
+        questions = [question["text"] for question in question_records]
+        speech.prefetch(questions)
+
+        #ask each question, record answers and append them to answers list
+        for question in question_records:
+            print(question["text"])
+            speak_question_simple(question["text"])
+            text, audio_data = record_voice()
+            answer.append(text)
+            if text:
+                # the recording is already trimmed to the speech
+                show_prescore(prescore_answer(text, question["type"], job_data,
+                                              duration=len(audio_data) / SAMPLE_RATE))
+                show_delivery(analyze_delivery(audio_data))
         
-        evaluate_answer(questions,answer,job_data,difficulty)
+        evaluations = evaluate_answers(questions,answer,job_data,difficulty)
+        if evaluations:
+            show_summary(evaluations, question_records)
         
     except Exception as e:
         print(f"Error:{e}")
         return None
 
-def evaluate_answer(question, answer, job_data, difficulty="easy"):
+def evaluate_answers(questions, answers, job_data, difficulty="easy"):
+    """Evaluate the whole interview with batched requests and print per-question feedback"""
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        evaluation_prompt = f"""
-You are an expert interview coach. Evaluate this candidate's answer and provide constructive feedback.
-
-CONTEXT:
-- Job Title: {job_data.get('job_title', 'N/A')}
-- Seniority Level: {job_data.get('seniority_level', 'N/A')}
-- Required Skills: {', '.join(job_data.get('technical_skills', []) + job_data.get('soft_skills', []))}
-- Difficulty Level: {difficulty}
-
-QUESTION ASKED:
-{question}
-
-CANDIDATE'S ANSWER:
-{answer}
-
-Please provide evaluation in this EXACT format:
-
-SCORE: [X/10]
-
-STRENGTHS:
-- [Strength 1]
-- [Strength 2]
-- [Strength 3]
-
-AREAS FOR IMPROVEMENT:
-- [Area 1]
-- [Area 2] 
-- [Area 3]
+        print("Evaluating your answers...")
+        evaluations = pipeline.evaluate_answers(api_key, questions, answers, job_data, difficulty)
+        for i, (question, evaluation) in enumerate(zip(questions, evaluations), 1):
+            print(f"\nQuestion {i}: {question}")
+            print(format_evaluation(evaluation))
+        return evaluations
 
-BETTER PHRASING SUGGESTIONS:
-Instead of: "[problematic phrase from answer]"
-Try: "[improved version]"
-
-Instead of: "[another problematic phrase]"
-Try: "[improved version]"
-
-RECOMMENDED KEYWORDS TO USE:
-- [keyword 1] - [why it's important]
-- [keyword 2] - [why it's important]
-- [keyword 3] - [why it's important]
-
-OVERALL FEEDBACK:
-[2-3 sentences of constructive advice]
-
-Evaluate based on:
-1. Structure and clarity
-2. Relevance to the question
-3. Use of specific examples
-4. Professional language
-5. Depth appropriate for {difficulty} level
-"""
-        
-        print("Evaluating your answer...")
-        response = model.generate_content(evaluation_prompt)
-        print(response.text)
-        
     except Exception as e:
-        print(f"Error evaluating answer: {e}")
-
+        print(f"Error evaluating answers: {e}")
+        return None
 
-def main():
+def show_summary(evaluations, question_records):
+    summary = summarize_evaluations(evaluations, question_records)
+    if summary["mean_score"] is None:
+        return
+    print(f"\nOverall score: {summary['mean_score']:.1f}/10")
+    for question_type, mean_score in summary["by_type"].items():
+        print(f"  {question_type.title()}: {mean_score:.1f}/10")
+    if summary["weakest_skills"]:
+        print("Skills to work on: " + ", ".join(
+            f"{skill} ({summary['by_skill'][skill]:.1f})" for skill in summary["weakest_skills"]
+        ))
+
+
+def batch_command(args):
+    """Pre-build question banks for every job in a JSONL/CSV file, appending results to a JSONL file"""
+    if not api_key:
+        print("Set GEMINI_API_KEY (or GEMINI_API_KEYS) to run a batch")
+        return 1
+    jobs, problems = batch.read_jobs(args.input)
+    for problem in problems:
+        print(f"Skipping {problem}")
+    done = batch.completed_ids(args.output) if args.resume else set()
+    pending = [job for job in jobs if job["id"] not in done]
+    if done:
+        print(f"Resuming: {len(jobs) - len(pending)} of {len(jobs)} jobs already in {args.output}")
+    if not pending:
+        return 0
+
+    succeeded = failed = questions = 0
+    start = time.monotonic()
+    with open(args.output, "a" if args.resume else "w", encoding="utf-8") as out:
+        try:
+            for finished, record in enumerate(batch.run_batch(api_key, pending, args.concurrency, not args.no_cache), 1):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                if "error" in record:
+                    failed += 1
+                    status = f"failed: {record['error']}"
+                else:
+                    succeeded += 1
+                    questions += len(record["questions"])
+                    status = f"{len(record['questions'])} questions"
+                rate = finished / (time.monotonic() - start) * 60
+                print(f"[{finished}/{len(pending)}] {record['id']} {record['job_profile']!r}: {status} "
+                      f"({record['seconds']:.1f}s, {rate:.1f} jobs/min)")
+        except KeyboardInterrupt:
+            print(f"Interrupted; rerun with --resume to continue from {args.output}")
+
+    elapsed = time.monotonic() - start
+    print(f"{succeeded} succeeded, {failed} failed in {elapsed:.1f}s "
+          f"({(succeeded + failed) / elapsed * 60:.1f} jobs/min, {questions / elapsed * 60:.1f} questions/min)")
+    return 1 if failed else 0
+
+
+def interactive():
+    # load Whisper while the user is still typing the job details
+    transcription.prewarm()
     job_profile=input("Enter Job Profile: ")
     job_description=input("Enter Job description: ")
     difficulty_level=input("Enter the difficulty level of the questions: ") #easy, medium, hard
@@ -426,5 +212,26 @@ def main():
     interview(job_data,behavioral_question_count, technical_question_count, situational_question_count, difficulty_level)
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI Interview Coach. Run without a command for a mock interview.")
+    commands = parser.add_subparsers(dest="command")
+    batch_parser = commands.add_parser(
+        "batch", help="generate question banks for many job descriptions without prompting",
+        description="Read jobs (job_profile, job_description, difficulty, and behavioral/technical/situational "
+                    "counts or a counts object) from a .jsonl or .csv file and write one JSON line per job.")
+    batch_parser.add_argument("input", help="jobs as JSON Lines or CSV (with a header row)")
+    batch_parser.add_argument("-o", "--output", default="question_bank.jsonl")
+    batch_parser.add_argument("-c", "--concurrency", type=int, default=batch.BATCH_CONCURRENCY,
+                              help="jobs processed at once")
+    batch_parser.add_argument("--resume", action="store_true",
+                              help="append to --output, skipping jobs it already holds (failed ones are retried)")
+    batch_parser.add_argument("--no-cache", action="store_true", help="ask the model again even for cached prompts")
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        return batch_command(args)
+    interactive()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -1,17 +1,16 @@
 import streamlit as st
-import sounddevice as sd
-import numpy as np
-from scipy.io.wavfile import write
-import google.generativeai as genai
-import json
-import re
 from dotenv import load_dotenv
 import os
-from gtts import gTTS
-import tempfile
-import time
-from io import BytesIO
-from faster_whisper import WhisperModel
+
+from interview_coach import pipeline, speech, transcription
+from interview_coach.analytics import summarize_evaluations
+from interview_coach.cache import get_cache
+from interview_coach.client import validate_key
+from interview_coach.delivery import MONOTONE_SEMITONES, analyze_delivery
+from interview_coach.evaluation import format_evaluation, parse_evaluation
+from interview_coach.keys import POOLED, get_pool
+from interview_coach.prescoring import prescore_answer
+from interview_coach.scheduler import get_scheduler
 
 st.set_page_config(
     page_title="AI Interview Coach",
@@ -20,6 +19,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# one Whisper model for every session, loaded in the background on first run
+transcription.prewarm()
+
 st.markdown("""
 <style>
     .main-header {
@@ -63,248 +65,49 @@ if 'current_step' not in st.session_state:
     st.session_state.current_step = 1
 if 'questions' not in st.session_state:
     st.session_state.questions = []
+if 'question_records' not in st.session_state:
+    st.session_state.question_records = []
 if 'answers' not in st.session_state:
     st.session_state.answers = []
+if 'answer_details' not in st.session_state:
+    st.session_state.answer_details = []
 if 'current_question_index' not in st.session_state:
     st.session_state.current_question_index = 0
 if 'interview_complete' not in st.session_state:
     st.session_state.interview_complete = False
 if 'tts_enabled' not in st.session_state:
     st.session_state.tts_enabled = True
+if 'speculative_questions' not in st.session_state:
+    st.session_state.speculative_questions = None
+if 'evaluation_jobs' not in st.session_state:
+    st.session_state.evaluation_jobs = {}
 
-jd_analysis_prompt = """
-Analyze this job description and extract key information. Return your response as a valid JSON object with no extra text or formatting.
-
-Job Profile: {job_profile}
-Job Description: {job_description}
-
-Return EXACTLY this JSON structure with actual values filled in:
-{{
-  "job_title": "exact title from posting",
-  "seniority_level": "entry/mid/senior/lead",
-  "technical_skills": ["skill1", "skill2"],
-  "soft_skills": ["skill1", "skill2"],
-  "industry": "industry type",
-  "experience_years": "X-Y years or not specified",
-  "team_role": "individual_contributor/team_lead/manager",
-  "key_responsibilities": ["responsibility1", "responsibility2"]
-}}
-
-IMPORTANT: Return ONLY the JSON object, no explanations or additional text.
-"""
-
-def create_behavioral_prompt(job_analysis, count, difficulty="easy"):
-    job_title = job_analysis.get('job_title', 'the position')
-    seniority = job_analysis.get('seniority_level', 'mid-level')
-    soft_skills = job_analysis.get('soft_skills', [])
-    responsibilities = job_analysis.get('key_responsibilities', [])
-    
-    difficulty_requirements = {
-        "easy": """- Focus on basic workplace scenarios and learning experiences
-- Ask about simple challenges and how they overcame them
-- Questions about teamwork and communication at entry level""",
-        "medium": """- Focus on project ownership and cross-team collaboration  
-- Ask about handling competing priorities and difficult decisions
-- Questions about leadership moments and conflict resolution""",
-        "hard": """- Focus on strategic decision-making and organizational impact
-- Ask about leading through crisis and complex problem-solving
-- Questions about mentoring, architecture decisions, and business impact"""
-    }
-    
-    prompt = f"""
-Generate {count} behavioral interview questions for a {job_title} position at {seniority} level.
-
-DIFFICULTY LEVEL: {difficulty.upper()}
-{difficulty_requirements[difficulty]}
-
-Focus on these soft skills: {', '.join(soft_skills)}
-Key responsibilities: {', '.join(responsibilities)}
-
-Requirements for each question:
-1. Use STAR method (Situation, Task, Action, Result)
-2. Match {difficulty} difficulty level complexity
-3. Be specific to this role and seniority level
-4. Test real workplace scenarios appropriate for {difficulty} level
-5. Be answerable in 2-3 minutes
-
-Format your response as:
-1. [First question]
-2. [Second question]
-3. [Third question]
-etc.
-
-Generate ONLY the numbered questions, no additional text.
-"""
-    return prompt
-
-def create_technical_prompt(job_analysis, count, difficulty="easy"):
-    job_title = job_analysis.get('job_title', 'the position')
-    seniority = job_analysis.get('seniority_level', 'mid-level')
-    technical_skills = job_analysis.get('technical_skills', [])
-    
-    difficulty_requirements = {
-        "easy": """- Focus on fundamental concepts and basic implementation
-- Ask about simple coding problems and basic system understanding
-- Test core technology knowledge without complex scenarios""",
-        "medium": """- Focus on practical problem-solving and best practices
-- Ask about debugging, optimization, and design patterns
-- Test ability to explain trade-offs and handle moderate complexity""",
-        "hard": """- Focus on system design, architecture, and complex problem-solving
-- Ask about scalability, distributed systems, and technical leadership
-- Test ability to design solutions and make architectural decisions"""
-    }
-    
-    prompt = f"""
-Generate {count} technical interview questions for a {job_title} position at {seniority} level.
-
-DIFFICULTY LEVEL: {difficulty.upper()}
-{difficulty_requirements[difficulty]}
-
-Required technical skills: {', '.join(technical_skills)}
-
-Requirements for each question:
-1. Match {difficulty} difficulty level complexity
-2. Focus on practical application appropriate for {difficulty} level
-3. Can be answered in 2-3 minutes
-4. Test real-world problem-solving at {difficulty} level
-5. Specific to the required technologies
-
-Format your response as:
-1. [First question]
-2. [Second question]
-3. [Third question]
-etc.
-
-Generate ONLY the numbered questions, no additional text.
-"""
-    return prompt
-
-def create_situational_prompt(job_analysis, count, difficulty="easy"):
-    job_title = job_analysis.get('job_title', 'the position')
-    industry = job_analysis.get('industry', 'technology')
-    team_role = job_analysis.get('team_role', 'individual_contributor')
-    
-    difficulty_requirements = {
-        "easy": """- Focus on individual contributor scenarios and basic professional situations
-- Ask about learning from mistakes and asking for help
-- Simple conflict resolution and priority management""",
-        "medium": """- Focus on project ownership and cross-team collaboration
-- Ask about managing competing demands and difficult conversations
-- Moderate stakeholder management and team coordination""",
-        "hard": """- Focus on organizational leadership and strategic decision-making
-- Ask about crisis management and transformational change
-- Complex stakeholder management and business-critical decisions"""
-    }
-    
-    prompt = f"""
-Generate {count} situational interview questions for a {job_title} in {industry} industry.
-
-DIFFICULTY LEVEL: {difficulty.upper()}
-{difficulty_requirements[difficulty]}
-
-Team role: {team_role}
-
-Requirements for each question:
-1. Present realistic workplace scenarios for {difficulty} level
-2. Test decision-making appropriate for {difficulty} complexity
-3. Match the responsibility level and industry context
-4. Start with "What would you do if..." or "How would you handle..."
-5. Be specific to the work environment
-
-Format your response as:
-1. [First question]
-2. [Second question]
-3. [Third question]
-etc.
-
-Generate ONLY the numbered questions, no additional text.
-"""
-    return prompt
-
-def extract_json_from_response(json_content):
-    try:
-        json_match = re.search(r'\{.*\}', json_content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            return json.loads(json_str)
-        else:
-            return json.loads(json_content)
-    except json.JSONDecodeError as e:
-        st.error(f"JSON parsing error: {e}")
-        return None
+# "pipelined": evaluate each answer in the background as it lands
+# "batch": evaluate all answers at the end with as few requests as possible
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "pipelined")
 
 def job_description_analysis(api_key, job_description, job_profile):
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-
-        formatted_prompt = jd_analysis_prompt.format(
-            job_profile=job_profile,
-            job_description=job_description
-        )
-
         with st.spinner("Analyzing your job description..."):
-            response = model.generate_content(formatted_prompt)
-
-        json_data = extract_json_from_response(response.text)
+            json_data = pipeline.analyze_job_description(api_key, job_description, job_profile)
+        st.success("Job Analysis Complete!")
+        return json_data
 
-        if json_data:
-            st.success("Job Analysis Complete!")
-            return json_data
-        else:
-            st.error("Failed to extract valid data")
-            return None
-        
     except Exception as e:
         st.error(f"Error analyzing job description: {e}")
         return None
 
-def parse_questions_response(response_text):
-    try:
-        questions = []
-        lines = response_text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^\d+\.\s+', line):
-                question = re.sub(r'^\d+\.\s+', '', line)
-                if question: 
-                    questions.append(question)
-        
-        return questions if questions else None
-        
-    except Exception as e:
-        st.error(f"Error parsing questions: {e}")
-        return None
+def generate_question_sets(api_key, job_data, counts, difficulty="easy", timeout=pipeline.GENERATION_TIMEOUT, use_cache=True,
+                           speculative=None):
+    """Generate all question categories concurrently, keeping the QUESTION_TYPES order"""
+    with st.spinner("Generating questions..."):
+        questions, errors = pipeline.generate_question_sets(
+            api_key, job_data, counts, difficulty, timeout, use_cache, speculative
+        )
 
-def generate_questions(api_key,job_data, question_type="behavioral", count=5, difficulty="easy"):
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-
-        if question_type == "behavioral":
-            prompt = create_behavioral_prompt(job_data, count, difficulty)
-        elif question_type == "technical":
-            prompt = create_technical_prompt(job_data, count, difficulty)
-        elif question_type == "situational":
-            prompt = create_situational_prompt(job_data, count, difficulty)
-        else:
-            st.error(f"Unknown question type: {question_type}")
-            return None
-        
-        with st.spinner(f"Generating {question_type} questions..."):
-            response = model.generate_content(prompt)
-        
-        questions = parse_questions_response(response.text)
-        if questions:
-            return questions
-        else:
-            st.error("Failed to parse questions from response")
-            return None
-            
-    except Exception as e:
-        st.error(f"Error generating questions: {e}")
-        return None
+    for question_type, error in errors.items():
+        st.error(f"Error generating {question_type} questions: {error}")
+    return questions
 
 def record_audio_streamlit():
     try:
@@ -341,87 +144,114 @@ def record_audio_streamlit():
         if audio_data:
             st.success("Recording received! Processing...")
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-                tmp_file.write(audio_data.getvalue())
-                tmp_file.flush()
-                
-                model = WhisperModel("small", device="cpu", compute_type="int8")
-                segments, info = model.transcribe(tmp_file.name)
-                text = " ".join([segment.text for segment in segments])
-                
-                os.unlink(tmp_file.name)
-                
-                return text
+            # decode once: the samples feed both Whisper and the delivery metrics
+            samples = transcription.prepare_audio(audio_data.getvalue())
+            return transcription.get_engine().transcribe(samples, detailed=True), samples
         
-        return None
+        return None, None
         
     except Exception as e:
         st.error(f"Error recording audio: {e}")
-        return None
-
-def evaluate_answer(api_key, question, answer, job_data, difficulty="easy"):
+        return None, None
+
+def show_prescore(prescore):
+    """Instant local feedback on a transcript, shown while the Gemini evaluation runs"""
+    pace_col, filler_col, skills_col = st.columns(3)
+    if prescore["words_per_minute"] is not None:
+        pace_col.metric("Pace", f"{prescore['words_per_minute']:.0f} wpm", prescore["pace"], delta_color="off")
+    filler_col.metric("Filler words", prescore["filler_count"], f"{prescore['filler_rate']:.1f} per 100 words",
+                      delta_color="off")
+    if prescore["skill_coverage"] is not None:
+        skills_col.metric("Skills mentioned", f"{prescore['skill_coverage']:.0%}")
+
+    if prescore["star"] is not None:
+        st.write("**STAR structure:** " + "  ".join(
+            f"{'✅' if present else '⬜'} {part.title()}" for part, present in prescore["star"].items()
+        ))
+    if prescore["fillers"]:
+        st.caption("Fillers: " + ", ".join(f'"{word}" ×{count}' for word, count in prescore["fillers"].items()))
+    if prescore["skills_mentioned"]:
+        st.caption("Mentioned: " + ", ".join(prescore["skills_mentioned"]))
+
+def show_delivery(delivery):
+    """Energy, pause and pitch metrics measured on the recorded answer"""
+    if delivery is None:
+        return
+    st.write("**Delivery:**")
+    ratio_col, pause_col, pitch_col = st.columns(3)
+    ratio_col.metric("Speaking time", f"{delivery['speaking_ratio']:.0%}")
+    pause_col.metric("Pauses", delivery["pause_count"], f"longest {delivery['longest_pause']:.1f}s",
+                     delta_color="off")
+    if delivery["pitch_variability"] is not None:
+        pitch_col.metric("Pitch variation", f"{delivery['pitch_variability']:.1f} st",
+                         "monotone" if delivery["pitch_variability"] < MONOTONE_SEMITONES else None,
+                         delta_color="off")
+
+def submit_evaluation(api_key, index):
+    """Start streaming the evaluation of answer ``index`` in the background as soon as it is recorded"""
+    st.session_state.evaluation_jobs[index] = pipeline.start_evaluation(
+        api_key,
+        st.session_state.questions[index],
+        st.session_state.answers[index],
+        st.session_state.job_data,
+        st.session_state.difficulty
+    )
+
+def evaluate_answers_in_batch(api_key):
+    """Evaluate every answer with batched requests (EVALUATION_MODE=batch)"""
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        evaluation_prompt = f"""
-You are an expert interview coach. Evaluate this candidate's answer and provide constructive feedback.
-
-CONTEXT:
-- Job Title: {job_data.get('job_title', 'N/A')}
-- Seniority Level: {job_data.get('seniority_level', 'N/A')}
-- Required Skills: {', '.join(job_data.get('technical_skills', []) + job_data.get('soft_skills', []))}
-- Difficulty Level: {difficulty}
-
-QUESTION ASKED:
-{question}
-
-CANDIDATE'S ANSWER:
-{answer}
-
-Please provide evaluation in this EXACT format:
-
-SCORE: [X/10]
+        with st.spinner(f"Evaluating {len(st.session_state.answers)} answers..."):
+            evaluations = pipeline.evaluate_answers(
+                api_key,
+                st.session_state.questions,
+                st.session_state.answers,
+                st.session_state.job_data,
+                st.session_state.difficulty
+            )
+        return evaluations
 
-STRENGTHS:
-- [Strength 1]
-- [Strength 2]
-- [Strength 3]
+    except Exception as e:
+        st.error(f"Error evaluating answers: {e}")
+        return [None] * len(st.session_state.answers)
 
-AREAS FOR IMPROVEMENT:
-- [Area 1]
-- [Area 2] 
-- [Area 3]
+def stream_evaluation(api_key, index):
+    """Render evaluation ``index`` as it streams in and return the final text"""
+    if index not in st.session_state.evaluation_jobs:
+        submit_evaluation(api_key, index)
+    job = st.session_state.evaluation_jobs[index]
 
-BETTER PHRASING SUGGESTIONS:
-Instead of: "[problematic phrase from answer]"
-Try: "[improved version]"
+    placeholder = st.empty()
+    try:
+        for text in job.updates():
+            if text:
+                placeholder.write(text)
+        return job.future.result()
+    except Exception as e:
+        placeholder.error(f"Error evaluating answer {index+1}: {e}")
+        return None
 
-RECOMMENDED KEYWORDS TO USE:
-- [keyword 1] - [why it's important]
-- [keyword 2] - [why it's important]
+def show_evaluation_summary():
+    """Per-type and per-skill scores over the whole interview, aggregated locally"""
+    summary = summarize_evaluations(st.session_state.evaluation_records, st.session_state.question_records)
+    if summary["mean_score"] is None:
+        return
 
-OVERALL FEEDBACK:
-[2-3 sentences of constructive advice]
+    st.markdown("### 📊 Interview Summary")
+    columns = st.columns(1 + len(summary["by_type"]))
+    columns[0].metric("Overall", f"{summary['mean_score']:.1f}/10")
+    for column, (question_type, mean_score) in zip(columns[1:], summary["by_type"].items()):
+        column.metric(question_type.title(), f"{mean_score:.1f}/10")
 
-Evaluate based on:
-1. Structure and clarity
-2. Relevance to the question
-3. Use of specific examples
-4. Professional language
-5. Depth appropriate for {difficulty} level
-"""
-        
-        with st.spinner("Evaluating your answer..."):
-            response = model.generate_content(evaluation_prompt)
-        
-        return response.text
-        
-    except Exception as e:
-        st.error(f"Error evaluating answer: {e}")
-        return None
+    if summary["by_skill"]:
+        st.bar_chart({"score": summary["by_skill"]})
+        weakest = ", ".join(f"{skill} ({summary['by_skill'][skill]:.1f})" for skill in summary["weakest_skills"])
+        st.write(f"**Skills to work on:** {weakest}")
 
 def api_setup():
+    if get_pool() is not None:
+        # the operator supplies the keys; users never see a key prompt
+        return POOLED
+
     if 'api_key_validated' not in st.session_state:
         st.session_state.api_key_validated = False
     if 'user_api_key' not in st.session_state:
@@ -452,10 +282,8 @@ def api_setup():
         if st.button("Validate & Continue", type="primary"):
             if api_key:
                 try:
-                    genai.configure(api_key=api_key)
-                    model = genai.GenerativeModel('gemini-2.5-flash')
-                    # Quick test
-                    response = model.generate_content("Hello")
+                    # metadata lookup, skipped for keys validated recently by any session
+                    validate_key(api_key)
                     
                     st.session_state.user_api_key = api_key
                     st.session_state.api_key_validated = True
@@ -482,13 +310,7 @@ def api_setup():
 
 def generate_audio_file(text, lang='en'):
     try:
-        tts = gTTS(text=text, lang=lang, slow=False)
-        
-        audio_buffer = BytesIO()
-        tts.write_to_fp(audio_buffer)
-        audio_buffer.seek(0)
-        
-        return audio_buffer.getvalue()
+        return speech.get_question_audio(text, lang)
         
     except Exception as e:
         st.error(f"Error generating audio: {e}")
@@ -518,6 +340,23 @@ def main():
                     st.markdown(f"🔄 **{step}**")
                 else:
                     st.markdown(f"⏳ {step}")
+
+            cache_stats = get_cache().stats()
+            st.caption(f"Response cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+            if api_key == POOLED:
+                key_stats = get_pool().stats()
+                busy = sum(1 for stats in key_stats.values() if stats["cooling_down"])
+                st.caption(
+                    f"API key pool: {len(key_stats)} keys, {busy} cooling down, "
+                    f"{sum(stats['last_minute'] for stats in key_stats.values())} requests in the last minute"
+                )
+            else:
+                scheduler_stats = get_scheduler(api_key).stats()
+                st.caption(
+                    f"Gemini requests: {scheduler_stats['requests']} "
+                    f"({scheduler_stats['retries']} retried, {scheduler_stats['hedges']} hedged), "
+                    f"rate limit at {scheduler_stats['rate_scale']:.0%} of the configured quota"
+                )
         
         # Step 1: Job Description Input
         if st.session_state.current_step == 1:
@@ -543,6 +382,10 @@ def main():
                     if job_data:
                         st.session_state.job_data = job_data
                         st.session_state.difficulty = difficulty
+                        # generate the default question set while the user reads the analysis
+                        st.session_state.speculative_questions = pipeline.speculate_questions(
+                            api_key, job_data, difficulty
+                        )
                         st.session_state.current_step = 2
                         st.rerun()
                 else:
@@ -591,55 +434,50 @@ def main():
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                behavioral_count = st.number_input("Behavioral Questions", min_value=0, max_value=10, value=2)
+                behavioral_count = st.number_input("Behavioral Questions", min_value=0, max_value=10, value=pipeline.DEFAULT_QUESTION_COUNTS["behavioral"])
             
             with col2:
-                technical_count = st.number_input("Technical Questions", min_value=0, max_value=10, value=2)
+                technical_count = st.number_input("Technical Questions", min_value=0, max_value=10, value=pipeline.DEFAULT_QUESTION_COUNTS["technical"])
             
             with col3:
-                situational_count = st.number_input("Situational Questions", min_value=0, max_value=10, value=1)
+                situational_count = st.number_input("Situational Questions", min_value=0, max_value=10, value=pipeline.DEFAULT_QUESTION_COUNTS["situational"])
             
             total_questions = behavioral_count + technical_count + situational_count
+            fresh_questions = st.checkbox(
+                "Generate fresh questions",
+                help="Skip previously generated questions for this job description"
+            )
             
             if total_questions > 0:
                 st.info(f"Total questions: {total_questions} (Estimated time: {total_questions * 2} minutes)")
                 
                 if st.button("Generate Questions & Start Interview", type="primary"):
-                    # Generate all questions
-                    all_questions = []
-                    question_types = []
-                    
-                    if behavioral_count > 0:
-                        behavioral_q = generate_questions(api_key,
-                            st.session_state.job_data, "behavioral", 
-                            behavioral_count, st.session_state.difficulty
-                        )
-                        if behavioral_q:
-                            all_questions.extend(behavioral_q)
-                            question_types.extend(["behavioral"] * len(behavioral_q))
-                    
-                    if technical_count > 0:
-                        technical_q = generate_questions(api_key,
-                            st.session_state.job_data, "technical", 
-                            technical_count, st.session_state.difficulty
-                        )
-                        if technical_q:
-                            all_questions.extend(technical_q)
-                            question_types.extend(["technical"] * len(technical_q))
-                    
-                    if situational_count > 0:
-                        situational_q = generate_questions(api_key,
-                            st.session_state.job_data, "situational", 
-                            situational_count, st.session_state.difficulty
-                        )
-                        if situational_q:
-                            all_questions.extend(situational_q)
-                            question_types.extend(["situational"] * len(situational_q))
+                    question_records = generate_question_sets(
+                        api_key,
+                        st.session_state.job_data,
+                        {
+                            "behavioral": behavioral_count,
+                            "technical": technical_count,
+                            "situational": situational_count,
+                        },
+                        st.session_state.difficulty,
+                        use_cache=not fresh_questions,
+                        # speculation read the cache, so it can't serve a fresh set
+                        speculative=None if fresh_questions else st.session_state.speculative_questions
+                    )
+                    st.session_state.speculative_questions = None
                     
-                    if all_questions:
+                    if question_records:
+                        all_questions = [question["text"] for question in question_records]
+                        if st.session_state.tts_enabled:
+                            # synthesize every question now so "Listen" plays instantly
+                            speech.prefetch(all_questions)
                         st.session_state.questions = all_questions
-                        st.session_state.question_types = question_types
+                        st.session_state.question_types = [question["type"] for question in question_records]
+                        st.session_state.question_records = question_records
                         st.session_state.answers = []
+                        st.session_state.answer_details = []
+                        st.session_state.evaluation_jobs = {}
                         st.session_state.current_question_index = 0
                         st.session_state.current_step = 4
                         st.rerun()
@@ -652,12 +490,13 @@ def main():
                 current_q_index = st.session_state.current_question_index
                 current_question = st.session_state.questions[current_q_index]
                 question_type = st.session_state.question_types[current_q_index]
+                skill = st.session_state.question_records[current_q_index]["skill"]
                 
                 st.markdown("### 🎤 Interview in Progress")
                 
                 progress = (current_q_index + 1) / len(st.session_state.questions)
                 st.progress(progress)
-                st.write(f"Question {current_q_index + 1} of {len(st.session_state.questions)} ({question_type.title()})")
+                st.write(f"Question {current_q_index + 1} of {len(st.session_state.questions)} ({question_type.title()}{f' · {skill}' if skill else ''})")
 
                 # Question display with TTS option
                 question_col1, question_col2 = st.columns([4, 1])
@@ -668,9 +507,9 @@ def main():
                 with question_col2:
                     if st.session_state.tts_enabled:
                         if st.button("🔊 Listen", key=f"tts_{current_q_index}", help="Click to hear the question"):
-                            audio_bytes = generate_audio_file(current_question)
-                            if audio_bytes:
-                                st.audio(audio_bytes, format="audio/mp3", autoplay=True)
+                            audio = generate_audio_file(current_question)
+                            if audio:
+                                st.audio(audio.data, format=f"audio/{audio.format}", autoplay=True)
 
                 col1, col2 = st.columns([2, 1])
                 
@@ -691,13 +530,22 @@ def main():
                             horizontal=True
                         )
                         
-                        answer = None
+                        transcript, samples = None, None
                         
                         if recording_method == "🎤 Browser Recording":
-                            answer = record_audio_streamlit()
+                            transcript, samples = record_audio_streamlit()
                         
-                        if answer:
-                            st.session_state.answers.append(answer)
+                        if transcript and transcript.text:
+                            st.session_state.answers.append(transcript.text)
+                            st.session_state.answer_details.append({
+                                "prescore": prescore_answer(
+                                    transcript.text, question_type, st.session_state.job_data,
+                                    transcript.segments, transcript.duration
+                                ),
+                                "delivery": analyze_delivery(samples),
+                            })
+                            if EVALUATION_MODE == "pipelined":
+                                submit_evaluation(api_key, current_q_index)
                             st.rerun()
                     
                     if len(st.session_state.answers) > current_q_index:
@@ -705,6 +553,7 @@ def main():
                         
                         st.write("**Your answer:**")
                         st.write(st.session_state.answers[current_q_index])
+                        show_prescore(st.session_state.answer_details[current_q_index]["prescore"])
                         
                         if st.button("➡️ Next Question", key=f"next_{current_q_index}"):
                             st.session_state.current_question_index += 1
@@ -742,29 +591,38 @@ def main():
             if not st.session_state.interview_complete:
                 st.info("Generating detailed feedback for all your answers...")
                 
-                evaluations = []
-                for i, (question, answer) in enumerate(zip(st.session_state.questions, st.session_state.answers)):
-                    with st.spinner(f"Evaluating answer {i+1} of {len(st.session_state.answers)}..."):
-                        evaluation = evaluate_answer(
-                            api_key,question, answer, st.session_state.job_data, st.session_state.difficulty
-                        )
-                        evaluations.append(evaluation)
-                
-                st.session_state.evaluations = evaluations
-                st.session_state.interview_complete = True
+                if EVALUATION_MODE == "batch":
+                    st.session_state.evaluation_records = evaluate_answers_in_batch(api_key)
+                    st.session_state.evaluations = [
+                        format_evaluation(record) for record in st.session_state.evaluation_records
+                    ]
+                    st.session_state.interview_complete = True
             
-            for i, (question, answer, evaluation) in enumerate(
-                zip(st.session_state.questions, st.session_state.answers, st.session_state.evaluations)
-            ):
-                with st.expander(f"Question {i+1}: {question[:50]}..."):
+            evaluations = []
+            for i, (question, answer) in enumerate(zip(st.session_state.questions, st.session_state.answers)):
+                with st.expander(f"Question {i+1}: {question[:50]}...", expanded=not st.session_state.interview_complete):
                     st.write("**Your Answer:**")
                     st.write(answer)
+                    show_delivery(st.session_state.answer_details[i]["delivery"])
                     
                     # st.markdown('<div class="evaluation-box">', unsafe_allow_html=True)
                     st.write("**Evaluation:**")
-                    st.write(evaluation)
+                    if st.session_state.interview_complete:
+                        st.write(st.session_state.evaluations[i])
+                    else:
+                        # finished evaluations render at once, running ones token by token
+                        evaluations.append(stream_evaluation(api_key, i))
                     st.markdown('</div>', unsafe_allow_html=True)
 
+            if not st.session_state.interview_complete:
+                st.session_state.evaluations = evaluations
+                st.session_state.evaluation_records = [
+                    parse_evaluation(text) if text else None for text in evaluations
+                ]
+                st.session_state.interview_complete = True
+
+            show_evaluation_summary()
+
             if st.button("🔄 Start New Interview", type="primary"):
                 for key in list(st.session_state.keys()):
                     del st.session_state[key]
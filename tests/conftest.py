@@ -0,0 +1,25 @@
+"""Shared fixtures. Run the suite from the repository root with ``python -m pytest``."""
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fake_gemini_server import FakeGemini, make_handler  # noqa: E402
+
+
+@pytest.fixture
+def fake_gemini():
+    """benchmarks/fake_gemini_server.py on a free local port; yields ``(url, fake)``"""
+    fake = FakeGemini(latency=0.0, slow_fraction=0.0, slow_latency=0.0, error_rate=0.0, rpm=0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(fake))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", fake
+    server.shutdown()
+    server.server_close()
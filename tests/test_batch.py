@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from interview_coach import batch, pipeline
+
+
+def test_normalize_fills_defaults():
+    job = batch._normalize_job({"job_description": "Build APIs"})
+    assert job["difficulty"] == "easy"
+    assert job["counts"] == pipeline.DEFAULT_QUESTION_COUNTS
+    assert job["id"] == batch._normalize_job({"job_description": "Build APIs"})["id"]
+
+
+def test_normalize_keeps_explicit_zero_counts():
+    job = batch._normalize_job({"job_description": "x", "counts": {"behavioral": 0, "technical": 3}})
+    assert job["counts"] == {"behavioral": 0, "technical": 3, "situational": 1}
+    # CSV columns win over the counts object; blank cells fall back
+    job = batch._normalize_job({"job_description": "x", "behavioral": "", "technical": "0", "situational": "2"})
+    assert job["counts"] == {"behavioral": 2, "technical": 0, "situational": 2}
+
+
+@pytest.mark.parametrize("row", [
+    [1, 2],
+    {"job_profile": "no description"},
+    {"job_description": "x", "difficulty": "extreme"},
+    {"job_description": "x", "counts": [1]},
+    {"job_description": "x", "technical": "many"},
+])
+def test_normalize_rejects_unusable_rows(row):
+    with pytest.raises((ValueError, TypeError, KeyError)):
+        batch._normalize_job(row)
+
+
+def test_read_jobs_reports_bad_jsonl_lines(tmp_path):
+    path = tmp_path / "jobs.jsonl"
+    path.write_text('{"id": "a", "job_description": "x"}\n{"job_descr\n[1, 2]\n\n{"job_description": "y"}\n')
+    jobs, problems = batch.read_jobs(str(path))
+    assert [job["job_description"] for job in jobs] == ["x", "y"]
+    assert [problem.split(":")[0] for problem in problems] == ["row 2", "row 3"]
+
+
+def test_read_jobs_csv(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text("job_profile,job_description,difficulty,behavioral,technical,situational\n"
+                    "Backend,Build APIs,Medium,1,2,0\n")
+    jobs, problems = batch.read_jobs(str(path))
+    assert problems == []
+    assert jobs[0]["difficulty"] == "medium"
+    assert jobs[0]["counts"] == {"behavioral": 1, "technical": 2, "situational": 0}
+
+
+def test_completed_ids_skips_failed_and_truncated_records(tmp_path):
+    path = tmp_path / "bank.jsonl"
+    path.write_text(
+        json.dumps({"id": "done", "questions": []}) + "\n"
+        + json.dumps({"id": "failed", "error": "boom"}) + "\n"
+        + json.dumps({"id": "partial", "questions": [], "error": "1 of 5 questions generated"}) + "\n"
+        + "[1]\n"
+        + '{"id": "cut'
+    )
+    assert batch.completed_ids(str(path)) == {"done"}
+    assert batch.completed_ids(str(tmp_path / "missing.jsonl")) == set()
+
+
+def fake_pipeline(monkeypatch, failing=()):
+    calls = []
+
+    def analyze(api_key, job_description, job_profile):
+        calls.append(job_description)
+        if job_description in failing:
+            raise RuntimeError("analysis failed")
+        return {"job_title": job_profile}
+
+    def generate(api_key, job_data, counts, difficulty, use_cache=True):
+        return [{"text": f"q{i}"} for i in range(sum(counts.values()))], {}
+
+    monkeypatch.setattr(pipeline, "analyze_job_description", analyze)
+    monkeypatch.setattr(pipeline, "generate_question_sets", generate)
+    return calls
+
+
+def test_resume_retries_only_failed_jobs(tmp_path, monkeypatch):
+    main = pytest.importorskip("main")
+    monkeypatch.setattr(main, "api_key", "key")
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text("".join(json.dumps({"id": name, "job_description": name}) + "\n" for name in ("a", "b", "c")))
+    output = str(tmp_path / "bank.jsonl")
+
+    calls = fake_pipeline(monkeypatch, failing={"b"})
+    assert main.main(["batch", str(jobs), "-o", output]) == 1
+    assert sorted(calls) == ["a", "b", "c"]
+    assert batch.completed_ids(output) == {"a", "c"}
+
+    calls = fake_pipeline(monkeypatch)
+    assert main.main(["batch", str(jobs), "-o", output, "--resume"]) == 0
+    assert calls == ["b"]
+    assert batch.completed_ids(output) == {"a", "b", "c"}
+    # nothing left to do
+    assert main.main(["batch", str(jobs), "-o", output, "--resume"]) == 0
+
+
+def test_incomplete_question_sets_are_failures(monkeypatch):
+    monkeypatch.setattr(pipeline, "analyze_job_description", lambda *args: {})
+    monkeypatch.setattr(pipeline, "generate_question_sets",
+                        lambda *args, **kwargs: ([{"text": "q"}], {"technical": TimeoutError("slow")}))
+    record = batch.process_job("key", batch._normalize_job({"job_description": "x"}))
+    assert record["error"] == "1 of 5 questions generated"
+    assert record["question_errors"] == {"technical": "slow"}
@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import Future
+
+from interview_coach import concurrency, pipeline
+from interview_coach.concurrency import MAX_WORKERS, StreamingJob, run_concurrently
+
+
+def test_streaming_jobs_do_not_delay_deadline_bound_tasks():
+    release = threading.Event()
+
+    def stream():
+        release.wait(5)
+        yield "done"
+
+    jobs = [StreamingJob(stream) for _ in range(MAX_WORKERS)]
+    try:
+        start = time.monotonic()
+        results = run_concurrently({"quick": lambda: "ok"}, timeout=1)
+        assert results == {"quick": ("ok", None)}
+        assert time.monotonic() - start < 0.5
+    finally:
+        release.set()
+    assert [job.future.result(timeout=5) for job in jobs] == ["done"] * MAX_WORKERS
+
+
+def test_streaming_job_falls_back_when_the_stream_fails():
+    def stream():
+        yield "partial"
+        raise ConnectionError("dropped")
+
+    job = StreamingJob(stream, fallback=lambda: "full text")
+    assert job.future.result(timeout=5) == "full text"
+    assert list(job.updates())[-1] == "full text"
+
+
+def test_run_concurrently_reports_errors_and_timeouts():
+    def fail():
+        raise ValueError("bad")
+
+    results = run_concurrently({"fail": fail, "slow": lambda: time.sleep(0.5)}, timeout=0.1)
+    assert isinstance(results["fail"][1], ValueError)
+    assert isinstance(results["slow"][1], TimeoutError)
+
+
+def test_queued_speculation_is_requested_afresh(monkeypatch):
+    requested = []
+
+    def request_questions(api_key, job_data, question_type, count, difficulty="easy", use_cache=True, existing=()):
+        requested.append((question_type, list(existing)))
+        return [{"text": f"{question_type} {i}"} for i in range(count)]
+
+    monkeypatch.setattr(pipeline, "request_questions", request_questions)
+    finished = Future()
+    finished.set_result([{"text": "speculated"}])
+    queued = Future()
+    questions, errors = pipeline.generate_question_sets(
+        "key", {}, {"behavioral": 1, "technical": 1, "situational": 0},
+        speculative={"behavioral": finished, "technical": queued, "situational": Future()},
+    )
+    assert errors == {}
+    assert queued.cancelled()
+    assert sorted(requested) == [("behavioral", [{"text": "speculated"}]), ("technical", [])]
+
+
+def test_speculation_runs_on_its_own_pool(monkeypatch):
+    names = []
+    monkeypatch.setattr(pipeline, "request_questions",
+                        lambda *args: names.append(threading.current_thread().name) or [])
+    futures = pipeline.speculate_questions("key", {}, counts={"behavioral": 1})
+    futures["behavioral"].result(timeout=5)
+    assert names[0].startswith("speculative")
+    assert concurrency.get_speculative_executor() is not concurrency.get_executor()
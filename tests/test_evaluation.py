@@ -0,0 +1,75 @@
+import re
+
+from interview_coach.evaluation import evaluate_answers_batch, split_batches
+
+
+def evaluation(index, score=7):
+    return {
+        "index": index,
+        "score": score,
+        "strengths": ["clear structure"],
+        "areas_for_improvement": ["quantify results"],
+        "phrasing_suggestions": [{"instead_of": "I helped", "try": "I led"}],
+        "keywords": [{"keyword": "ownership", "reason": "shows initiative"}],
+        "overall_feedback": "Solid answer.",
+    }
+
+
+def prompt_indices(prompt):
+    return [int(index) for index in re.findall(r"^ANSWER (\d+)$", prompt, re.MULTILINE)]
+
+
+class Model:
+    """Stands in for generate_json: ``replies`` maps a call number to a function of the prompt's indices"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def __call__(self, prompt, schema):
+        self.prompts.append(prompt_indices(prompt))
+        return self.replies[len(self.prompts) - 1](self.prompts[-1])
+
+
+def test_all_answers_in_one_batch():
+    model = Model(lambda indices: [evaluation(index) for index in indices])
+    evaluations = evaluate_answers_batch(model, ["q1", "q2", "q3"], ["a1", "a2", "a3"], {})
+    assert [record["index"] for record in evaluations] == [0, 1, 2]
+    assert model.prompts == [[0, 1, 2]]
+
+
+def test_partially_malformed_batch_keeps_the_valid_records_and_retries_the_rest():
+    model = Model(
+        lambda indices: [evaluation(0, 7), evaluation(1, 8), evaluation(2, 11)],
+        lambda indices: [evaluation(index, 6) for index in indices],
+    )
+    evaluations = evaluate_answers_batch(model, ["q1", "q2", "q3"], ["a1", "a2", "a3"], {})
+    assert [record["score"] for record in evaluations] == [7, 8, 6]
+    assert model.prompts == [[0, 1, 2], [2]]
+
+
+def test_answers_still_missing_after_retries_are_errors():
+    model = Model(
+        lambda indices: [evaluation(0), {**evaluation(1), "score": "7/10"}],
+        lambda indices: [],
+    )
+    evaluations = evaluate_answers_batch(model, ["q1", "q2"], ["a1", "a2"], {})
+    assert evaluations[0]["score"] == 7
+    assert "error" in evaluations[1]
+    assert model.prompts == [[0, 1], [1]]
+
+
+def test_failed_request_marks_its_batch_without_retrying():
+    def fail(indices):
+        raise ConnectionError("dropped")
+
+    model = Model(fail)
+    evaluations = evaluate_answers_batch(model, ["q1", "q2"], ["a1", "a2"], {})
+    assert all(record["error"] == "dropped" for record in evaluations)
+    assert len(model.prompts) == 1
+
+
+def test_split_batches_respects_size_limit():
+    pairs = [(i, "question", "answer") for i in range(5)]
+    batches = split_batches(pairs, token_budget=10 ** 6, max_batch_size=2)
+    assert [len(batch) for batch in batches] == [2, 2, 1]
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from interview_coach import client as client_module
+from interview_coach import keys as keys_module
+from interview_coach.keys import KeyPool
+
+
+class RateLimited(Exception):
+    code = 429
+
+
+class FakeClient:
+    """Replaces GeminiClient: answers 429 for the first ``failures`` calls across all keys"""
+    failures = 0
+    calls = []
+
+    def __init__(self, api_key, model_name, scheduler=None):
+        self.api_key = api_key
+
+    def generate(self, prompt, use_cache=True, timeout=None):
+        FakeClient.calls.append(self.api_key)
+        if len(FakeClient.calls) <= FakeClient.failures:
+            raise RateLimited("429")
+        return self.api_key
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    monkeypatch.setattr(client_module, "GeminiClient", FakeClient)
+    FakeClient.calls = []
+    return FakeClient
+
+
+def fast_pool(keys, cooldown):
+    pool = KeyPool(keys, cooldown=cooldown)
+    for key in keys:
+        pool.scheduler(key).backoff_base = 0.01
+        pool.scheduler(key).backoff_max = 0.02
+    return pool
+
+
+def test_least_loaded_key_is_picked():
+    pool = KeyPool(["a", "b"])
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first, second} == {"a", "b"}
+    pool.release(first)
+    pool.release(second)
+
+
+def test_rate_limited_call_moves_to_another_key(fake_clients):
+    fake_clients.failures = 1
+    pool = fast_pool(["a", "b"], cooldown=10)
+    result = client_module.PooledClient(pool).generate("prompt")
+    assert result != fake_clients.calls[0]
+    assert sum(stats["rate_limited"] for stats in pool.stats().values()) == 1
+
+
+def test_single_key_waits_out_its_cooldown(fake_clients):
+    fake_clients.failures = 2
+    pool = fast_pool(["a"], cooldown=0.2)
+    start = time.monotonic()
+    assert client_module.PooledClient(pool).generate("prompt") == "a"
+    # two 429s, each followed by the cooldown before the key is used again
+    assert time.monotonic() - start >= 0.4
+    assert pool.stats()["…a"]["in_flight"] == 0
+
+
+def test_gives_up_after_the_retry_limit(fake_clients):
+    fake_clients.failures = 100
+    pool = fast_pool(["a"], cooldown=0.01)
+    with pytest.raises(RateLimited):
+        client_module.PooledClient(pool).generate("prompt")
+    assert len(fake_clients.calls) == pool.scheduler("a").retries + 1
+
+
+def test_cooldown_longer_than_the_timeout_raises_the_429(fake_clients):
+    fake_clients.failures = 1
+    pool = fast_pool(["a"], cooldown=60)
+    start = time.monotonic()
+    with pytest.raises(RateLimited):
+        client_module.PooledClient(pool).generate("prompt", timeout=1)
+    assert time.monotonic() - start < 1
+
+
+def test_acquire_waits_for_a_cooling_key():
+    pool = KeyPool(["a"], cooldown=0.2)
+    pool.release(pool.acquire(), RateLimited())
+    start = time.monotonic()
+    pool.release(pool.acquire())
+    assert time.monotonic() - start >= 0.15
+    pool.release(pool.acquire(), RateLimited())
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+
+def test_request_history_stays_bounded_without_stats(monkeypatch):
+    pool = KeyPool(["a"])
+    clock = [0.0]
+    monkeypatch.setattr(keys_module.time, "monotonic", lambda: clock[0])
+    for _ in range(10_000):
+        clock[0] += 1.0
+        pool.release(pool.acquire())
+    assert len(pool._states["a"].recent) <= keys_module.STATS_WINDOW + 1
+    assert pool.stats()["…a"]["total"] == 10_000
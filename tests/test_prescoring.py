@@ -0,0 +1,35 @@
+from interview_coach.prescoring import count_fillers, prescore_answer, skill_coverage
+
+
+def test_like_counts_only_as_a_discourse_marker():
+    assert count_fillers("I would like to work with things like C++") == {}
+    assert count_fillers("It was, like, really hard. Like, we had no tests.") == {"like": 2}
+
+
+def test_other_fillers():
+    assert count_fillers("Um, you know, I basically uhh rewrote it") == {"um": 1, "you know": 1, "basically": 1,
+                                                                         "uhh": 1}
+
+
+def test_short_skill_names_need_an_exact_token():
+    job = {"technical_skills": ["C", "Go", "R"], "soft_skills": []}
+    mentioned, missing = skill_coverage("I wrote C++ and C#, then had to let it go. Our rollout was rough.", job)
+    assert mentioned == []
+    mentioned, _ = skill_coverage("I rewrote the C parser in Go and checked it with R.", job)
+    assert mentioned == ["C", "Go", "R"]
+
+
+def test_longer_skills_ignore_case_and_hyphens():
+    job = {"technical_skills": ["Python", "machine learning", "C++"], "soft_skills": ["communication"]}
+    mentioned, missing = skill_coverage("Built machine-learning tools in python and c++.", job)
+    assert mentioned == ["Python", "machine learning", "C++"]
+    assert missing == ["communication"]
+
+
+def test_prescore_pace_and_star():
+    text = ("When I was at my last job, my task was to cut costs. I decided to move us to spot instances. "
+            "As a result we reduced spend by 30%.")
+    result = prescore_answer(text, "behavioral", {}, duration=13)
+    assert result["star"] == {"situation": True, "task": True, "action": True, "result": True}
+    assert result["pace"] == "good"
+    assert prescore_answer(text, "technical", {}, duration=60)["star"] is None
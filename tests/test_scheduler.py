@@ -0,0 +1,188 @@
+import threading
+import time
+
+import pytest
+
+from interview_coach.scheduler import RateLimiter, RequestScheduler, get_scheduler
+
+
+class APIError(Exception):
+    """Stands in for google.api_core exceptions, which carry the HTTP status as ``code``"""
+
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def failing(*codes, result="ok"):
+    """A request that raises APIError for each of ``codes`` in turn, then returns ``result``"""
+    remaining = list(codes)
+    calls = []
+
+    def request(timeout):
+        calls.append(timeout)
+        if remaining:
+            raise APIError(remaining.pop(0))
+        return result
+
+    request.calls = calls
+    return request
+
+
+def fast_scheduler(**kwargs):
+    kwargs.setdefault("limiter", RateLimiter(requests_per_minute=0, tokens_per_minute=0))
+    return RequestScheduler(backoff_base=0.01, backoff_max=0.02, **kwargs)
+
+
+def test_limiter_allows_a_burst_then_waits_for_refill():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=0)
+    start = time.monotonic()
+    for _ in range(600):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.5
+    limiter.acquire()
+    # one request refills every 0.1 s at 600 RPM
+    assert time.monotonic() - start >= 0.08
+
+
+def test_limiter_times_out_instead_of_waiting_past_the_deadline():
+    limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=0)
+    limiter.acquire()
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.05)
+
+
+def test_limiter_token_budget_and_debt():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=6000)
+    limiter.acquire(tokens=6000)
+    limiter.charge(100)
+    with pytest.raises(TimeoutError):
+        # 100 tokens of debt plus 10 new ones need 1.1 s of refill
+        limiter.acquire(tokens=10, timeout=1.0)
+
+
+def test_throttle_lowers_the_rate_and_recover_restores_it():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=0, backoff=0.5, recovery=0.25)
+    limiter.throttle()
+    assert limiter.scale == 0.5
+    start = time.monotonic()
+    limiter.acquire()
+    # the request bucket is spent and refills at 300 RPM: 0.2 s per request
+    assert time.monotonic() - start >= 0.15
+    limiter.recover()
+    limiter.recover()
+    limiter.recover()
+    assert limiter.scale == 1.0
+
+
+def test_throttle_never_stops_the_limiter():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=0, backoff=0.1)
+    for _ in range(10):
+        limiter.throttle()
+    assert limiter.scale > 0
+
+
+def test_retries_transient_errors_with_backoff():
+    scheduler = fast_scheduler(retries=3)
+    request = failing(503, 500)
+    assert scheduler.call(request) == "ok"
+    assert len(request.calls) == 3
+    assert scheduler.stats()["retries"] == 2
+
+
+def test_does_not_retry_client_errors():
+    scheduler = fast_scheduler(retries=3)
+    request = failing(400)
+    with pytest.raises(APIError):
+        scheduler.call(request)
+    assert len(request.calls) == 1
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_gives_up_after_the_retry_limit():
+    scheduler = fast_scheduler(retries=2)
+    request = failing(503, 503, 503, 503)
+    with pytest.raises(APIError):
+        scheduler.call(request)
+    assert len(request.calls) == 3
+
+
+def test_rate_limited_requests_throttle_the_limiter():
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=0)
+    scheduler = fast_scheduler(limiter=limiter, retries=3)
+    assert scheduler.call(failing(429)) == "ok"
+    assert limiter.throttles == 1
+    assert limiter.scale < 1.0
+    assert scheduler.stats()["throttles"] == 1
+
+
+def test_429_is_left_to_the_caller_when_not_retryable():
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=0)
+    scheduler = fast_scheduler(limiter=limiter, retry_status={503})
+    with pytest.raises(APIError):
+        scheduler.call(failing(429))
+    # still throttled, so the next request on this key slows down
+    assert limiter.throttles == 1
+
+
+def test_passes_the_attempt_timeout_to_the_request():
+    scheduler = fast_scheduler(timeout=7)
+    request = failing()
+    scheduler.call(request)
+    scheduler.call(request, timeout=3)
+    assert request.calls == [7, 3]
+
+
+def test_hedges_a_slow_request():
+    scheduler = fast_scheduler(hedge_percentile=50)
+    for _ in range(20):
+        scheduler.call(lambda timeout: "warm-up")
+    calls = []
+    lock = threading.Lock()
+
+    def request(timeout):
+        with lock:
+            calls.append(timeout)
+            first = len(calls) == 1
+        if first:
+            time.sleep(1.0)
+            return "primary"
+        return "backup"
+
+    start = time.monotonic()
+    assert scheduler.call(request) == "backup"
+    assert time.monotonic() - start < 0.5
+    stats = scheduler.stats()
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_does_not_hedge_while_warming_up_or_when_disabled():
+    scheduler = fast_scheduler(hedge_percentile=50)
+    assert scheduler.hedge_delay() is None
+    disabled = fast_scheduler(hedge_percentile=0)
+    for _ in range(20):
+        disabled.call(lambda timeout: "ok")
+    assert disabled.hedge_delay() is None
+
+
+def test_schedulers_are_per_api_key():
+    assert get_scheduler("key-a") is get_scheduler("key-a")
+    assert get_scheduler("key-a") is not get_scheduler("key-b")
+
+
+def test_client_against_fake_server(fake_gemini, monkeypatch):
+    pytest.importorskip("google.generativeai")
+    from interview_coach import client as client_module
+    from interview_coach.schemas import JobAnalysis
+
+    url, fake = fake_gemini
+    monkeypatch.setattr(client_module, "API_ENDPOINT", url)
+    monkeypatch.setattr(client_module, "TRANSPORT", "rest")
+    fake.error_rate = 0.5
+    client = client_module.GeminiClient("fake-key", scheduler=fast_scheduler(retries=8))
+
+    assert "SCORE" in client.generate(f"evaluate {time.time()}", use_cache=False)
+    analysis = client.generate_json(f"analyze {time.time()}", JobAnalysis, use_cache=False)
+    assert set(analysis) == set(JobAnalysis.__annotations__)
+    assert fake.counts["requests"] >= 2
@@ -0,0 +1,36 @@
+import pytest
+
+from interview_coach.schemas import parse_evaluations, parse_job_analysis, parse_questions
+
+
+def test_parse_questions_drops_malformed_items():
+    data = [{"text": " Tell me about a conflict ", "skill": "teamwork"}, {"text": 3, "skill": "x"}, {"text": ""}]
+    questions = parse_questions(data, "behavioral", "easy")
+    assert questions == [{"text": "Tell me about a conflict", "type": "behavioral", "difficulty": "easy",
+                          "skill": "teamwork"}]
+
+
+def test_parse_job_analysis_requires_every_field():
+    with pytest.raises(ValueError):
+        parse_job_analysis({"job_title": "Engineer"})
+
+
+def test_parse_evaluations_checks_types_and_score_range():
+    valid = {
+        "index": 0, "score": 7, "strengths": [], "areas_for_improvement": [],
+        "phrasing_suggestions": [{"instead_of": "a", "try": "b"}],
+        "keywords": [{"keyword": "k", "reason": "r"}], "overall_feedback": "ok",
+    }
+    data = [
+        valid,
+        {**valid, "index": 1, "score": 11},
+        {**valid, "index": 2, "score": "7/10"},
+        {**valid, "index": 3, "keywords": [{"keyword": "k"}]},
+        {**valid, "index": 4, "score": True},
+    ]
+    assert list(parse_evaluations(data)) == [0]
+
+
+def test_parse_evaluations_rejects_a_non_list():
+    with pytest.raises(ValueError):
+        parse_evaluations({"index": 0})
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from interview_coach import speech
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeBackend:
+    def __init__(self, name, audio_format, fail=False):
+        self.name = name
+        self.format = audio_format
+        self.fail = fail
+        self.calls = 0
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, lang):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("offline")
+        return f"{self.name}:{text}".encode()
+
+
+@pytest.fixture
+def tts(tmp_path, monkeypatch):
+    gtts = FakeBackend("gtts", "mp3")
+    espeak = FakeBackend("espeak", "wav")
+    synthesizer = speech.SpeechSynthesizer([gtts, espeak], cooldown=60)
+    cache = speech.SpeechCache(directory=str(tmp_path))
+    monkeypatch.setattr(speech, "_synthesizer", synthesizer)
+    monkeypatch.setattr(speech, "_cache", cache)
+    return gtts, espeak, synthesizer, tmp_path
+
+
+def test_preferred_backend_audio_is_cached_on_disk(tts):
+    gtts, _, _, directory = tts
+    audio = speech.get_question_audio("Tell me about yourself")
+    assert audio.backend == "gtts"
+    assert [path.suffix for path in directory.iterdir()] == [".mp3"]
+    speech.get_question_audio("Tell me about yourself")
+    assert gtts.calls == 1
+
+
+def test_fallback_audio_stays_in_memory_and_expires(tts, monkeypatch):
+    gtts, espeak, synthesizer, directory = tts
+    gtts.fail = True
+    assert speech.get_question_audio("Why this role?").backend == "espeak"
+    assert list(directory.iterdir()) == []
+    # served from memory while the preferred backend is cooling down
+    assert speech.get_question_audio("Why this role?").backend == "espeak"
+    assert espeak.calls == 1
+
+    gtts.fail = False
+    monkeypatch.setattr(speech.time, "monotonic", lambda: 10 ** 9)
+    assert speech.get_question_audio("Why this role?").backend == "gtts"
+
+
+def test_fallback_files_on_disk_are_ignored(tts):
+    _, _, _, directory = tts
+    key = speech.speech_key("Hi", "en")
+    (directory / f"{key}.wav").write_bytes(b"old espeak audio")
+    assert speech.get_question_audio("Hi").backend == "gtts"
+
+
+def test_unknown_backend_fails_on_first_use_not_import():
+    script = ("import interview_coach.speech as speech\n"
+              "try:\n    speech.get_synthesizer()\nexcept ValueError as e:\n    print(e)\n")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True,
+                            env={**os.environ, "TTS_BACKENDS": "gtts,espek"})
+    assert result.returncode == 0, result.stderr
+    assert "Unknown TTS backend: espek" in result.stdout